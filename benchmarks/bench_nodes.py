@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             bench_nodes.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+
+"""
+Benchmarks the memory per node and construction rate of File and Dir against
+CompactNode.
+
+Usage::
+
+    $ python benchmarks/bench_nodes.py --nodes 200000
+
+Requires Python 3.4+ (for tracemalloc).
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+import tracemalloc
+
+from ext_pylib.files import CompactNode, Dir, File
+from ext_pylib.user import get_current_username, get_current_groupname
+
+
+def measure(build):
+    """Returns (seconds, bytes allocated) for build()."""
+    tracemalloc.start()
+    start = time.time()
+    nodes = build()
+    elapsed = time.time() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert nodes
+    return elapsed, size
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--nodes', type=int, default=200000)
+    args = parser.parse_args()
+
+    owner, group = get_current_username(), get_current_groupname()
+    atts = [{'path' : '/var/www/site' + str(i // 100) + ('/' if i % 10 == 0 else '/file' + str(i)),
+             'perms' : 0o755 if i % 10 == 0 else 0o644, 'owner' : owner, 'group' : group}
+            for i in range(args.nodes)]
+
+    def nodes():
+        """Builds File and Dir instances."""
+        return [(Dir if att['path'].endswith('/') else File)(att) for att in atts]
+
+    def compact_nodes():
+        """Builds CompactNodes."""
+        return CompactNode.from_iterable(atts)
+
+    print('{0:>12} {1:>10} {2:>14} {3:>12}'.format('', 'seconds', 'nodes/second', 'bytes/node'))
+    for name, build in (('File/Dir', nodes), ('CompactNode', compact_nodes)):
+        elapsed, size = measure(build)
+        print('{0:>12} {1:>10.3f} {2:>14.0f} {3:>12.1f}'.format(name, elapsed, args.nodes / elapsed,
+                                                                float(size) / args.nodes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             bench_verify.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+
+"""
+Benchmarks verify_many() wall-clock time against the number of workers.
+
+Usage::
+
+    $ python benchmarks/bench_verify.py --files 5000 --root /mnt/nfs/tmp
+
+Point --root at a network filesystem to see the benefit; on a local disk the
+stats are fast enough that the pool mostly adds overhead.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from ext_pylib.files import File, verify_many
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--root', default=None)
+    parser.add_argument('--workers', default='1,2,4,8,16,32')
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(dir=args.root)
+    try:
+        nodes = []
+        for i in range(args.files):
+            path = os.path.join(root, 'file' + str(i))
+            open(path, 'w').close()
+            os.chmod(path, 0o640)
+            nodes.append(File({'path' : path, 'perms' : 0o640}))
+
+        baseline = None
+        print('{0:>8} {1:>10} {2:>10}'.format('workers', 'seconds', 'speedup'))
+        for workers in [int(w) for w in args.workers.split(',')]:
+            start = time.time()
+            report = verify_many(nodes, workers=workers)
+            elapsed = time.time() - start
+            assert report.ok
+            baseline = baseline or elapsed
+            print('{0:>8} {1:>10.3f} {2:>9.2f}x'.format(workers, elapsed, baseline / elapsed))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
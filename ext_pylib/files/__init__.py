@@ -10,5 +10,17 @@ Class objects for files and directories.
 
 from __future__ import absolute_import
 
+from .atomic import AtomicFile, FsyncBatch, atomic_write, fsync_dir
+from .cache import ContentCache
+from .compact import CompactNode
+from .copier import CopyStats, copy_file, copy_tree
+from .create import CreateStats, create_many
 from .dir import Dir
 from .file import File, Section, SectionFile, Template, TemplateFile, Parsable, ParsableFile
+from .node import exists_batch
+from .render import RenderStats, render_many
+from .sections import apply_sections, apply_sections_to, splice_section
+from .sync import SyncStats, build_manifest, sync_tree
+from .template import CompiledTemplate
+from .verify import VerifyReport, VerifyResult, verify_node, verify_many, repair_many
+from .watch import InotifyWatcher, PollingWatcher, Watcher, get_watcher, new_watcher
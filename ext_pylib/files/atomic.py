@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             atomic.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.atomic
+~~~~~~~~~~~~~~~~~~~~~~
+
+Atomic writes. The data is written to a temporary file next to the target,
+fsync'ed, and renamed over the target, so a crash leaves either the old file
+or the new one but never a truncated one. To make the rename itself durable,
+the directory is fsync'ed as well.
+
+The temporary file is created readable only by its owner, and it is given its
+final permissions (and owner) before anything is written to it, so the data
+is never readable by anyone the file being replaced wasn't readable by.
+
+When writing many files, the directory fsyncs can be deferred with an
+FsyncBatch so that each directory is fsync'ed only once. A file that is too
+large to hold in memory can be written in pieces with an AtomicFile.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from binascii import hexlify
+import errno
+import os
+import threading
+
+
+class FsyncBatch(object):
+    """Collects directories to fsync and fsyncs each of them once.
+    Thread-safe. The directories are flushed when used as a context manager.
+
+    Usage::
+
+        >>> from ext_pylib.files import FsyncBatch, atomic_write
+
+        >>> with FsyncBatch() as batch:
+        ...     for path, data in configs:
+        ...         atomic_write(path, data, batch=batch)
+    """
+
+    def __init__(self):
+        """Initializes a new, empty FsyncBatch."""
+        self._lock = threading.Lock()
+        self.directories = set()
+
+    def __enter__(self):
+        """Returns the batch."""
+        return self
+
+    def __exit__(self, *args):
+        """Flushes the batch."""
+        self.flush()
+
+    def add(self, directory):
+        """Adds a directory to be fsync'ed."""
+        with self._lock:
+            self.directories.add(directory)
+
+    def flush(self):
+        """Fsyncs every directory added since the last flush."""
+        with self._lock:
+            directories, self.directories = self.directories, set()
+        for directory in sorted(directories):
+            fsync_dir(directory)
+
+
+def fsync_dir(directory):
+    """Fsyncs a directory so that renames within it are durable."""
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+_UMASK_LOCK = threading.Lock()
+
+
+def _umask():
+    """Returns the process' umask (without changing it, if /proc has it)."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (IOError, OSError, ValueError):
+        pass
+    with _UMASK_LOCK:
+        umask = os.umask(0o077)
+        os.umask(umask)
+    return umask
+
+
+def _create_temp(path):
+    """Creates and opens an unused temporary file beside path.
+    Returns (fd, temp_path)."""
+    directory, name = os.path.split(path)
+    while True:
+        temp_path = os.path.join(directory, '.' + name + '.' + hexlify(os.urandom(6)).decode() + '.tmp')
+        try:
+            # Only readable by the owner until its final mode is set
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), temp_path
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+
+class AtomicFile(object):
+    """A file that is written to a temporary file beside path and renamed over
+    path when the context exits, so it can be written in pieces (e.g. when
+    streaming a large file) and still replace path atomically. If the context
+    exits with an exception, or discard() was called, path is left untouched.
+
+    See atomic_write() for the params.
+
+    Usage::
+
+        >>> from ext_pylib.files import AtomicFile
+
+        >>> with AtomicFile('/the/path/file') as output:
+        ...     for line in lines:
+        ...         output.write(line)
+    """
+
+    def __init__(self, path, perms=None, sync=True, sync_dir=True, batch=None):
+        """Initializes a new AtomicFile. Nothing is opened until it is entered."""
+        self.path = path
+        self.perms = perms
+        self.sync = sync
+        self.sync_dir = sync_dir
+        self.batch = batch
+        self.handle = self.temp_path = None
+        self.discarded = False
+
+    def __enter__(self):
+        """Creates and opens the temporary file, with its final permissions
+        (and owner, if allowed), before anything is written to it. Returns the
+        AtomicFile."""
+        fd, self.temp_path = _create_temp(self.path)
+        try:
+            self._set_mode(fd)
+        except BaseException:
+            os.close(fd)
+            os.remove(self.temp_path)
+            raise
+        self.handle = os.fdopen(fd, 'w')
+        self.discarded = False
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Renames the temporary file over path (or removes it)."""
+        if exc_type is not None or self.discarded:
+            self._remove_temp()
+            return False
+        try:
+            self._commit()
+        except BaseException:
+            self._remove_temp()
+            raise
+        if self.sync_dir:
+            directory = os.path.dirname(self.path) or '.'
+            if self.batch is not None:
+                self.batch.add(directory)
+            else:
+                fsync_dir(directory)
+        return False
+
+    def write(self, data):
+        """Writes data to the temporary file."""
+        self.handle.write(data)
+
+    def discard(self):
+        """Leaves path untouched when the context exits."""
+        self.discarded = True
+
+    def _set_mode(self, fd):
+        """Gives the temporary file perms, or else the permissions (and owner,
+        if allowed) of the file being replaced, or else the permissions a new
+        file would get."""
+        try:
+            current = os.stat(self.path)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+            current = None
+        if current is not None:
+            try:
+                os.fchown(fd, current.st_uid, current.st_gid)
+            except OSError:  # Only root can give a file away
+                pass
+        if self.perms:
+            os.fchmod(fd, self.perms)
+        elif current is not None:
+            os.fchmod(fd, current.st_mode & 0o7777)
+        else:
+            os.fchmod(fd, 0o666 & ~_umask())
+
+    def _commit(self):
+        """Fsyncs, closes, and renames the temporary file over path."""
+        with self.handle as handle:
+            handle.flush()
+            if self.sync:
+                os.fsync(handle.fileno())
+        os.rename(self.temp_path, self.path)  # Atomic on POSIX
+
+    def _remove_temp(self):
+        """Closes and removes the temporary file."""
+        try:
+            self.handle.close()
+        except (OSError, IOError):
+            pass
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+
+def atomic_write(path, data, perms=None, sync=True, sync_dir=True, batch=None):
+    """Atomically replaces the file at path with data.
+
+    :param perms: The permissions of the new file. If not given, the
+        permissions (and owner, if allowed) of the file being replaced are kept.
+    :param sync: If True, the data is fsync'ed before the rename.
+    :param sync_dir: If True, the directory is fsync'ed after the rename.
+    :param batch: An FsyncBatch to defer the directory fsync to.
+    """
+    with AtomicFile(path, perms, sync, sync_dir, batch) as output:
+        output.write(data)
+    return True
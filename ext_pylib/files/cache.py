@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             cache.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.cache
+~~~~~~~~~~~~~~~~~~~~~
+
+A process-wide cache of the contents of files, validated against the file on
+disk. Each entry is keyed on the file's (mtime, size, inode), so a read costs
+one stat() when the file hasn't changed and a full read when it has (or when
+it was replaced, e.g. by an atomic write). Every File with the same path
+shares one cached copy.
+
+The cache is a least recently used cache bounded by the total size of the
+cached contents. A File uses it when created with atts['cache'] (see file.py).
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from collections import OrderedDict
+import errno
+import os
+import threading
+
+
+def stat_key(stat):
+    """Returns the (mtime, size, inode) of a stat result that the cached
+    contents are validated against."""
+    return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size, stat.st_ino)
+
+
+class ContentCache(object):
+    """A thread-safe LRU cache of the contents of files, validated by stat().
+
+    :param max_bytes: The most (in characters) to hold. The least recently
+        used contents are evicted first; contents larger than this are never
+        cached.
+
+    Usage::
+
+        >>> from ext_pylib.files import ContentCache
+
+        >>> cache = ContentCache(max_bytes=1048576)
+        >>> cache.read('/the/path/file')  # Read from disk
+        'The data...'
+        >>> cache.read('/the/path/file')  # Just a stat()
+        'The data...'
+    """
+
+    def __init__(self, max_bytes=64 * 1048576):
+        """Initializes a new, empty ContentCache."""
+        self.max_bytes = max_bytes
+        self.bytes = self.hits = self.misses = 0
+        self._entries = OrderedDict()  # path: (key, data), oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of cached files."""
+        return len(self._entries)
+
+    def read(self, path):
+        """Returns the contents of the file at path, from the cache if the
+        file hasn't changed since it was cached. Returns None if nothing is
+        at path."""
+        path = os.path.abspath(path)
+        try:
+            key = stat_key(os.stat(path))
+        except OSError as error:
+            if error.errno not in (errno.ENOENT, errno.ENOTDIR):
+                raise
+            self.discard(path)
+            return None
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None and entry[0] == key:
+                self._entries[path] = entry  # Now the most recently used
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.bytes -= len(entry[1])
+            self.misses += 1
+        # Key on the file that is read, in case it was replaced since the stat()
+        with open(path, 'r') as file_handle:
+            key = stat_key(os.fstat(file_handle.fileno()))
+            data = file_handle.read()
+        self._put(path, key, data)
+        return data
+
+    def _put(self, path, key, data):
+        """Caches data, evicting the least recently used contents as needed."""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self.bytes -= len(entry[1])
+            self._entries[path] = (key, data)
+            self.bytes += len(data)
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+
+    def discard(self, path):
+        """Drops the contents of the file at path (if cached)."""
+        with self._lock:
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self.bytes -= len(entry[1])
+
+    def clear(self):
+        """Drops everything."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+CACHE = ContentCache()  # Shared by every File created with atts['cache']
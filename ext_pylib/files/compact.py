@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             compact.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.compact
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A compact node for holding large inventories of files and directories (e.g.
+hundreds of thousands of entries to verify). It uses __slots__ instead of a
+__dict__ and doesn't look up its owner and group when it is created; they
+are only checked when validate() is called (or when the node is verified).
+
+A CompactNode can be verified directly (see verify.py) and converted to a full
+File or Dir with to_node() when it needs to be created or modified.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .dir import Dir
+from .file import File
+from .node import normalize_path
+from .verify import verify_node
+from ..user import getpwnam, getgrnam
+
+
+class CompactNode(object):
+    """A lightweight, slotted description of a file or directory. A path
+    ending in '/' is a directory.
+
+    :param path: The path (string) of the node.
+    :param perms: The permissions (int or octal) of the node.
+    :param owner: The owner (string) of the node. Not checked until validate().
+    :param group: The group (string) of the node. Not checked until validate().
+
+    Usage::
+
+        >>> from ext_pylib.files import CompactNode
+
+        >>> nodes = CompactNode.from_iterable([('/the/path/', 0o755, 'root', 'root'),
+        ...                                    {'path' : '/the/path/file', 'perms' : 0o600}])
+        >>> nodes[0].is_dir
+        True
+        >>> nodes[1].to_node()
+        File({'path' : '/the/path/file', 'perms' : 0o600, 'owner' : None, 'group' : None})
+    """
+
+    __slots__ = ('path', 'perms', 'owner', 'group')
+
+    def __init__(self, path, perms=None, owner=None, group=None):
+        """Initializes a new CompactNode."""
+        if path is None:
+            raise ValueError('"path" is required for a CompactNode.')
+        self.path = normalize_path(path)
+        if perms:
+            perms = int(perms)
+            if not 0 <= perms <= 511:
+                raise ValueError('"perms" cannot be set to ' + format(perms, '#o') + '.')
+        self.perms = perms or None
+        self.owner = owner
+        self.group = group
+
+    def __repr__(self):
+        """Returns a python string that evaluates to the object instance."""
+        return 'CompactNode({0!r}, {1}, {2!r}, {3!r})'.format(
+            self.path, format(self.perms, '#o') if self.perms else None, self.owner, self.group)
+
+    def __str__(self):
+        """Returns a string with the path."""
+        return self.path
+
+    @classmethod
+    def from_iterable(cls, items):
+        """Returns a list of CompactNodes from an iterable of atts dicts (as
+        passed to File or Dir) or (path, perms, owner, group) tuples."""
+        nodes = []
+        append = nodes.append
+        for item in items:
+            if isinstance(item, dict):
+                append(cls(item.get('path'), item.get('perms'), item.get('owner'), item.get('group')))
+            else:
+                append(cls(*item))
+        return nodes
+
+    @property
+    def is_dir(self):
+        """Returns True if the node is a directory."""
+        return self.path.endswith('/')
+
+    def validate(self):
+        """Makes sure the owner and group (if any) exist. Raises KeyError if
+        either doesn't. Returns True."""
+        if self.owner:
+            getpwnam(self.owner)
+        if self.group:
+            getgrnam(self.group)
+        return True
+
+    def to_node(self):
+        """Returns a full File or Dir instance for this node."""
+        atts = {'path' : self.path, 'perms' : self.perms}
+        if self.owner:
+            atts['owner'] = self.owner
+        if self.group:
+            atts['group'] = self.group
+        return (Dir if self.is_dir else File)(atts)
+
+    def check(self, repair=False):
+        """Verifies the node without printing anything. Returns a VerifyResult
+        (see verify.py). To repair it, the node is converted with to_node()."""
+        return verify_node(self.to_node() if repair else self, repair)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             copier.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.copier
+~~~~~~~~~~~~~~~~~~~~~~
+
+A non-interactive copy engine for directory trees. The tree is walked once
+(creating directories as it goes) while the files are copied on a pool of
+threads. Each file is copied with the fastest method available:
+
+    1. a reflink (FICLONE), on filesystems that support it (btrfs, xfs, ...)
+    2. os.copy_file_range() (Python 3.8+)
+    3. os.sendfile() (Python 3.3+)
+    4. a plain read/write loop
+
+What happens to files that already exist is decided by a policy instead of a
+prompt: 'skip' them, 'overwrite' them, or only overwrite them if the source is
+'newer'.
+
+Links in the destination are never written through: a link where a file is
+to be copied is replaced by the file, and nothing is copied into a linked
+directory (it is reported as an error).
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+from multiprocessing.pool import ThreadPool
+import os
+import shutil
+import stat as stat_module
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+POLICIES = ('skip', 'overwrite', 'newer')
+
+FICLONE = 0x40049409  # From linux/fs.h
+
+# Errors that mean a fast path isn't supported here (rather than a real error).
+_UNSUPPORTED = set(getattr(errno, name) for name in
+                   ('EXDEV', 'EINVAL', 'ENOSYS', 'ENOTSUP', 'EOPNOTSUPP', 'ENOTTY', 'EBADF', 'EPERM')
+                   if hasattr(errno, name))
+
+
+class CopyStats(object):
+    """The results of a copy_tree().
+
+    `methods` counts the number of files copied with each method ('reflink',
+    'copy_file_range', 'sendfile', or 'read'). `errors` is a list of
+    (path, error) tuples.
+    """
+
+    def __init__(self):
+        """Initializes new, empty CopyStats."""
+        self.files = self.bytes = self.skipped = self.dirs = 0
+        self.methods = {}
+        self.errors = []
+        self.elapsed = 0.0
+
+    def __str__(self):
+        """Returns a human readable summary."""
+        return 'Copied {0} files ({1:.1f} MB) in {2:.2f}s, skipped {3}, {4} errors: ' \
+               '{5:.0f} files/s, {6:.1f} MB/s'.format(self.files, self.bytes / 1048576.0, self.elapsed,
+                                                       self.skipped, len(self.errors),
+                                                       self.files_per_second, self.bytes_per_second / 1048576.0)
+
+    @property
+    def files_per_second(self):
+        """Returns the number of files copied per second."""
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self):
+        """Returns the number of bytes copied per second."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+def _reflink(source_fd, destination_fd, size):  # pylint: disable=unused-argument
+    """Clones the source into the destination (sharing extents)."""
+    if fcntl is None:
+        raise OSError(errno.ENOTSUP, 'fcntl is not available')
+    fcntl.ioctl(destination_fd, FICLONE, source_fd)
+
+
+def _copy_file_range(source_fd, destination_fd, size):
+    """Copies with os.copy_file_range() (in the kernel)."""
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(source_fd, destination_fd, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+
+def _sendfile(source_fd, destination_fd, size):
+    """Copies with os.sendfile() (in the kernel)."""
+    copied = 0
+    while copied < size:
+        count = os.sendfile(destination_fd, source_fd, copied, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+
+def _read_write(source_fd, destination_fd, size):  # pylint: disable=unused-argument
+    """Copies with a plain read/write loop."""
+    while True:
+        chunk = os.read(source_fd, 1048576)
+        if not chunk:
+            break
+        while chunk:
+            chunk = chunk[os.write(destination_fd, chunk):]
+
+
+METHODS = [('reflink', _reflink)]
+if hasattr(os, 'copy_file_range'):
+    METHODS.append(('copy_file_range', _copy_file_range))
+if hasattr(os, 'sendfile'):
+    METHODS.append(('sendfile', _sendfile))
+METHODS.append(('read', _read_write))
+
+
+def _copy_stat(source_stat, destination_fd, destination):
+    """Gives the open destination the permissions and times of source_stat."""
+    os.fchmod(destination_fd, stat_module.S_IMODE(source_stat.st_mode))
+    if os.utime in getattr(os, 'supports_fd', ()):
+        os.utime(destination_fd, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    else:  # Python 2
+        os.utime(destination, (source_stat.st_atime, source_stat.st_mtime))
+
+
+def copy_file(source, destination, methods=None):
+    """Copies the file source to destination (with its permissions and times,
+    like shutil.copy2()) using the fastest method that works. If destination
+    is a link, the link is replaced rather than written through. Returns a
+    tuple of (bytes copied, name of the method used)."""
+    methods = METHODS if methods is None else methods
+    if os.path.islink(destination):
+        os.remove(destination)
+    source_fd = os.open(source, os.O_RDONLY)
+    try:
+        source_stat = os.fstat(source_fd)
+        size = source_stat.st_size
+        # O_NOFOLLOW: a link put there since is an error (ELOOP), not followed
+        destination_fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_NOFOLLOW', 0),
+                                 0o600)
+        try:
+            for name, method in methods:
+                try:
+                    method(source_fd, destination_fd, size)
+                    break
+                except (OSError, IOError) as error:
+                    if error.errno not in _UNSUPPORTED or name == 'read':
+                        raise
+                    # Start the next method over from the beginning
+                    os.lseek(source_fd, 0, os.SEEK_SET)
+                    os.lseek(destination_fd, 0, os.SEEK_SET)
+                    os.ftruncate(destination_fd, 0)
+            _copy_stat(source_stat, destination_fd, destination)
+        finally:
+            os.close(destination_fd)
+    finally:
+        os.close(source_fd)
+    return size, name
+
+
+def _should_copy(source, destination, policy):
+    """Returns True if destination should be (over)written under policy."""
+    try:
+        destination_stat = os.lstat(destination)
+    except OSError as error:
+        if error.errno == errno.ENOENT:
+            return True
+        raise
+    if policy == 'overwrite':
+        return True
+    if policy == 'newer':
+        return os.stat(source).st_mtime > destination_stat.st_mtime
+    return False
+
+
+def _copy_job(job):
+    """Pool worker: copies one file. Returns (source, bytes, method, error);
+    method is None if the file was skipped."""
+    source, destination, policy, symlinks = job
+    try:
+        if symlinks and os.path.islink(source):
+            if os.path.lexists(destination):
+                if policy == 'skip':
+                    return source, 0, None, None
+                os.remove(destination)
+            os.symlink(os.readlink(source), destination)
+            return source, 0, 'symlink', None
+        if not _should_copy(source, destination, policy):
+            return source, 0, None, None
+        size, method = copy_file(source, destination)
+        return source, size, method, None
+    except (OSError, IOError) as error:
+        return source, 0, None, error
+
+
+def copy_tree(source, destination, policy='skip', workers=4, symlinks=False):
+    """Copies the contents of the directory source into destination (which is
+    created if needed). Files that already exist are handled by policy (see
+    POLICIES). If symlinks is True, symbolic links are copied as links rather
+    than followed. Returns CopyStats."""
+    if policy not in POLICIES:
+        raise ValueError('"policy" must be one of: ' + ', '.join(POLICIES) + '.')
+    stats = CopyStats()
+    start = time.time()
+    copied_dirs = []
+
+    def jobs():
+        """Walks source, creating directories and yielding file copy jobs."""
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=not symlinks):
+            target = os.path.normpath(os.path.join(destination, os.path.relpath(dirpath, source)))
+            try:
+                os.makedirs(target)
+                stats.dirs += 1
+            except OSError as error:
+                if error.errno != errno.EEXIST:
+                    stats.errors.append((dirpath, error))
+                    del dirnames[:]  # Don't descend into it
+                    continue
+                if dirpath != source and os.path.islink(target):
+                    stats.errors.append((dirpath, OSError(errno.ELOOP, 'Not copying into a linked directory', target)))
+                    del dirnames[:]
+                    continue
+            copied_dirs.append((dirpath, target))
+            if symlinks:  # Links to directories are copied as links, too
+                filenames = filenames + [name for name in dirnames if os.path.islink(os.path.join(dirpath, name))]
+            for name in filenames:
+                yield os.path.join(dirpath, name), os.path.join(target, name), policy, symlinks
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        for path, size, method, error in pool.imap_unordered(_copy_job, jobs(), 16):
+            if error is not None:
+                stats.errors.append((path, error))
+            elif method is None:
+                stats.skipped += 1
+            else:
+                stats.files += 1
+                stats.bytes += size
+                stats.methods[method] = stats.methods.get(method, 0) + 1
+    finally:
+        pool.close()
+        pool.join()
+
+    for dirpath, target in reversed(copied_dirs):  # Once their contents are done
+        try:
+            shutil.copystat(dirpath, target)
+        except OSError as error:
+            stats.errors.append((dirpath, error))
+    stats.elapsed = time.time() - start
+    return stats
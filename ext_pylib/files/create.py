@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             create.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.create
+~~~~~~~~~~~~~~~~~~~~~~
+
+Creating many files at once. File.create() checks (and maybe creates) the
+parent directory, prompts, prints, and sets the permissions and ownership by
+path for every file. create_many() instead creates every parent directory
+once up front and then, for each file, opens it, writes its data, and sets
+its permissions and ownership through the open fd.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+import os
+import time
+
+from ..user import get_current_username, get_current_groupname, getpwnam, getgrnam
+
+
+POLICIES = ('skip', 'overwrite')
+
+
+class CreateStats(object):  # pylint: disable=too-few-public-methods
+    """The results of a create_many(). `created` counts the files that were
+    created (or overwritten), `dirs` the directories that had to be made
+    (including missing ancestors of the parent directories), and `skipped`
+    the files that already existed. `errors` is a list of (path, error)
+    tuples and `elapsed` is the time taken in seconds."""
+
+    def __init__(self):
+        """Initializes new, empty CreateStats."""
+        self.created = self.skipped = self.dirs = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def __str__(self):
+        """Returns a human readable summary."""
+        return 'Created {0} files and {1} directories, skipped {2}, {3} errors in {4:.2f}s'.format(
+            self.created, self.dirs, self.skipped, len(self.errors), self.elapsed)
+
+
+def _ids(owner, group, ids):
+    """Returns (uid, gid) for owner and group (with the same defaults as
+    Node.chown()), memoized in the dict ids."""
+    owner = owner or get_current_username()
+    group = group or ('nogroup' if owner == 'nobody' else get_current_groupname())
+    if (owner, group) not in ids:
+        ids[(owner, group)] = (getpwnam(owner).pw_uid, getgrnam(group).gr_gid)
+    return ids[(owner, group)]
+
+
+def create_many(files, policy='skip'):
+    """Creates the files (File instances), with their data, permissions,
+    owner, and group. Each distinct parent directory is created once, before
+    any of the files. Files that already exist are skipped or overwritten,
+    depending on policy. Nothing is printed and nothing is prompted for.
+    Returns CreateStats."""
+    if policy not in POLICIES:
+        raise ValueError('"policy" must be one of: ' + ', '.join(POLICIES) + '.')
+    stats = CreateStats()
+    start = time.time()
+    files = [a_file for a_file in files if a_file.path]
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if policy == 'skip' else os.O_TRUNC)
+
+    # Sorted, so a parent is created (and counted) before its children
+    for directory in sorted(set(os.path.dirname(a_file.path) for a_file in files)):
+        if directory and not os.path.isdir(directory):
+            missing, ancestor = 0, directory
+            while ancestor and not os.path.isdir(ancestor):
+                missing += 1
+                ancestor = os.path.dirname(ancestor)
+            try:
+                os.makedirs(directory)
+                stats.dirs += missing
+            except OSError as error:
+                if error.errno != errno.EEXIST:
+                    stats.errors.append((directory, error))
+
+    ids = {}
+    for a_file in files:
+        try:
+            uid, gid = _ids(a_file.owner, a_file.group, ids)
+            # With perms, it is only opened to the owner until fchmod()
+            fd = os.open(a_file.path, flags, 0o600 if a_file.perms else 0o666)
+        except KeyError as error:
+            stats.errors.append((a_file.path, error))
+            continue
+        except OSError as error:
+            if error.errno == errno.EEXIST:
+                stats.skipped += 1
+            else:
+                stats.errors.append((a_file.path, error))
+            continue
+        try:
+            data = getattr(a_file, 'data', None)
+            if data:
+                if not isinstance(data, bytes):
+                    data = data.encode('utf-8')
+                while data:
+                    data = data[os.write(fd, data):]
+            if a_file.perms:
+                os.fchmod(fd, a_file.perms)
+            os.fchown(fd, uid, gid)
+            stats.created += 1
+        except OSError as error:
+            stats.errors.append((a_file.path, error))
+        finally:
+            os.close(fd)
+    stats.elapsed = time.time() - start
+    return stats
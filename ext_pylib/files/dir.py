@@ -18,11 +18,108 @@ It extends Node.
 
 from __future__ import absolute_import, print_function, unicode_literals
 
+from fnmatch import translate
 import os
+import re
 import shutil
 
-from .node import Node
+from .copier import copy_tree
+from .node import Node, remember_exists, shared_node
+from .sync import sync_tree
+from .tree import chmod_tree, chown_tree
 from ..input import prompt
+from ..user import get_current_username, get_current_groupname, getpwnam, getgrnam
+
+try:
+    from os import scandir
+except ImportError:  # Python < 3.5
+    try:
+        from scandir import scandir  # The backport, if it is installed
+    except ImportError:
+        scandir = None
+
+
+class _ListdirEntry(object):  # pylint: disable=too-few-public-methods
+    """A stand-in for os.DirEntry where scandir() isn't available."""
+
+    def __init__(self, directory, name):
+        """Initializes the entry for name in directory."""
+        self.name = name
+        self.path = os.path.join(directory, name)
+
+    def is_dir(self, follow_symlinks=True):
+        """Returns True if the entry is a directory."""
+        if not follow_symlinks and os.path.islink(self.path):
+            return False
+        return os.path.isdir(self.path)
+
+
+def _entries(directory):
+    """Yields the entries of directory (as os.DirEntry objects, if possible)."""
+    if scandir is None:
+        for name in os.listdir(directory):
+            yield _ListdirEntry(directory, name)
+        return
+    iterator = scandir(directory)
+    try:
+        for entry in iterator:
+            yield entry
+    finally:
+        if hasattr(iterator, 'close'):
+            iterator.close()
+
+
+def _compile_globs(patterns):
+    """Returns one compiled regex matching any of the glob patterns (a string
+    or a list of strings), or None if there aren't any."""
+    if not patterns:
+        return None
+    if isinstance(patterns, str) or not hasattr(patterns, '__iter__'):
+        patterns = [patterns]
+    return re.compile('|'.join('(?:' + translate(pattern) + ')' for pattern in patterns))
+
+
+def walk(top, include=None, exclude=None, max_depth=None, follow_symlinks=False, onerror=None):
+    """Walks the directory top with scandir(), yielding a tuple of
+    (path, is_dir) for each entry below it. Directories are yielded before
+    their contents. Whether an entry is a directory comes from the DirEntry
+    (usually without a stat() call).
+
+    :param include: Glob pattern(s); only matching entries are yielded.
+        Directories that don't match are still walked.
+    :param exclude: Glob pattern(s); matching entries are neither yielded nor
+        walked.
+    :param max_depth: How many levels deep to walk. 1 is just the entries of
+        top. None has no limit.
+    :param follow_symlinks: If True, links to directories are walked.
+    :param onerror: Called with the OSError if a directory can't be read.
+        By default, the directory is skipped.
+
+    Patterns are matched against both the name of the entry and its path
+    relative to top.
+    """
+    include, exclude = _compile_globs(include), _compile_globs(exclude)
+    stack = [(top, '', 1)]
+    while stack:
+        directory, relative, depth = stack.pop()
+        subdirs = []
+        try:
+            for entry in _entries(directory):
+                entry_relative = relative + entry.name
+                if exclude and (exclude.match(entry.name) or exclude.match(entry_relative)):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                except OSError:
+                    is_dir = False
+                if not include or include.match(entry.name) or include.match(entry_relative):
+                    yield entry.path, is_dir
+                if is_dir and (max_depth is None or depth < max_depth):
+                    subdirs.append((entry.path, entry_relative + '/', depth + 1))
+        except OSError as error:
+            if onerror is not None:
+                onerror(error)
+        stack.extend(reversed(subdirs))  # So they are walked in order
 
 
 def copytree(source, destination, symlinks=False, ignore=None):
@@ -36,15 +133,14 @@ def copytree(source, destination, symlinks=False, ignore=None):
                 copytree(item_src, item_dst)
             else:
                 shutil.copytree(item_src, item_dst, symlinks, ignore)
-            return True
         else: # It's a file
             if os.path.exists(item_dst):
                 if not prompt(item_dst + ' already exists. Replace with ' + item_src + '?'):
                     print('Skipping.')
-                    return True
+                    continue
                 os.remove(item_dst) # It's a file that already exists; remove it, then copy
             shutil.copy2(item_src, item_dst)
-            return True
+    return True
 
 
 class Dir(Node):
@@ -79,6 +175,7 @@ class Dir(Node):
         print('Creating directory "' + self.path + '"...', end=' ')
         try:
             os.makedirs(self.path)
+            remember_exists(self.path, True)
             print('[OK]')
         except Exception as error: # pylint: disable=broad-except
             print('[ERROR]')
@@ -99,6 +196,7 @@ class Dir(Node):
             print('Removing "' + self.path + '"...', end=' ')
             try:
                 shutil.rmtree(self.path)
+                remember_exists(self.path, False)
                 print('[OK]')
                 return True
             except Exception as error: # pylint: disable=broad-except
@@ -106,8 +204,11 @@ class Dir(Node):
                 print(error)
                 return False
 
-    def fill(self, fill_with):
-        """Fills the directory with the contents of "fill_with" (another Dir instance)."""
+    def fill(self, fill_with, policy=None, workers=4):
+        """Fills the directory with the contents of "fill_with" (another Dir instance).
+        If a policy ('skip', 'overwrite', or 'newer') is given, files that
+        already exist are handled by it (rather than prompting) and the files
+        are copied in parallel by the copy engine (see copier.py)."""
         if not self.exists():
             print('Copy failed. [ERROR]')
             raise IOError(self.path + 'does not exist')
@@ -115,6 +216,12 @@ class Dir(Node):
             print('Copy failed. [ERROR]')
             raise IOError(fill_with + 'does not exist')
         print('Filling "' + self.path + '" with contents of "' + fill_with + '"...')
+        if policy:
+            stats = copy_tree(fill_with.path, self.path, policy, workers)
+            for path, error in stats.errors:
+                print('[ERROR] ' + path + ': ' + str(error))
+            print(str(stats) + (' [ERROR]' if stats.errors else ' [OK]'))
+            return not stats.errors
         try:
             copytree(fill_with.path, self.path) # copytree(source, destination)
             print('Copy complete. [OK]')
@@ -124,6 +231,83 @@ class Dir(Node):
             print(error)
             return False
 
+    def walk(self, include=None, exclude=None, max_depth=None, follow_symlinks=False, onerror=None):
+        """Lazily yields a File or Dir node for everything in the directory
+        (recursively). See walk() above for the arguments. Paths that aren't
+        valid for a node are skipped (and their ValueError passed to onerror)."""
+        from .file import File  # file.py imports dir.py
+        for path, is_dir in walk(self.path, include, exclude, max_depth, follow_symlinks, onerror):
+            try:
+                node = Dir({'path' : path}) if is_dir else File({'path' : path})
+            except ValueError as error:
+                if onerror is not None:
+                    onerror(error)
+                continue
+            yield node
+
+    def iterdir(self, include=None, exclude=None):
+        """Lazily yields a File or Dir node for each entry in the directory."""
+        return self.walk(include, exclude, max_depth=1)
+
+    def chmod_tree(self, file_perms=None, dir_perms=None):
+        """Sets the permissions of every file and directory in the directory
+        (recursively), skipping any that already match (see tree.py).
+        dir_perms defaults to the directory's perms; files are left alone
+        unless file_perms is given."""
+        if not self.path:
+            return True
+        if dir_perms is None:
+            dir_perms = self.perms
+        print('Setting permissions in ' + self.path + ' to "' + ('None' if file_perms is None else format(file_perms, '#o')) + \
+              '" (files) and "' + ('None' if dir_perms is None else format(dir_perms, '#o')) + '" (directories)...', end=' ')
+        return self._print_tree_stats(chmod_tree(self.path, file_perms, dir_perms))
+
+    def chown_tree(self, owner=None, group=None):
+        """Sets the owner and group of every file and directory in the
+        directory (recursively), skipping any that already match (see
+        tree.py). The names are resolved once, with the same defaults as
+        chown()."""
+        if not self.path:
+            return True
+        if not owner:
+            owner = self.owner or get_current_username()
+        if not group:
+            group = self.group or ('nogroup' if owner == 'nobody' else get_current_groupname())
+        print('Setting owner in ' + self.path + ' to "' + owner + ':' + group + '"...', end=' ')
+        try:
+            uid, gid = getpwnam(owner).pw_uid, getgrnam(group).gr_gid
+        except KeyError as error:
+            print('[FAILED]')
+            print(error)
+            return False
+        return self._print_tree_stats(chown_tree(self.path, uid, gid))
+
+    @staticmethod
+    def _print_tree_stats(stats):
+        """Prints the TreeStats of a chmod_tree() or chown_tree() (and any
+        errors). Returns True if there weren't any errors."""
+        print('[FAILED]' if stats.errors else '[OK]')
+        print(stats)
+        for path, error in stats.errors:
+            print('[ERROR] ' + path + ': ' + str(error))
+        return not stats.errors
+
+    def sync_from(self, other, delete=False, checksum=False, manifest=None, workers=4):
+        """Syncs the directory with the contents of "other" (another Dir
+        instance), copying only the files that changed (see sync.py). If
+        delete is True, anything that isn't in "other" is removed. If a
+        manifest path is given, the manifests are kept there so that the next
+        sync is mostly stat-only."""
+        if not other.exists(): # Requires a Dir object, NOT a string
+            print('Sync failed. [ERROR]')
+            raise IOError(other + 'does not exist')
+        print('Syncing "' + self.path + '" with contents of "' + other + '"...')
+        stats = sync_tree(other.path, self.path, delete, checksum, manifest, workers)
+        for path, error in stats.errors:
+            print('[ERROR] ' + path + ': ' + str(error))
+        print(str(stats) + (' [ERROR]' if stats.errors else ' [OK]'))
+        return not stats.errors
+
     # pylint: disable=no-member
     @Node.path.setter
     def path(self, path):
@@ -138,5 +322,12 @@ class Dir(Node):
 
     @property
     def parent_dir(self):
-        """Returns a Dir instance representing the parent directory."""
-        return Dir(self.parent_node.get_atts())
+        """Returns a Dir instance representing the parent directory. Like
+        parent_node, it is remembered and shared with the other nodes in the
+        same directory."""
+        cached = getattr(self, '_parent_dir', None)
+        if cached is not None and cached[0] == self.path:
+            return cached[1]
+        parent = shared_node(Dir, self.parent_node.get_atts())
+        self._parent_dir = (self.path, parent)  # pylint: disable=attribute-defined-outside-init
+        return parent
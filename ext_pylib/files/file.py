@@ -18,11 +18,22 @@ Section, and Template.
 
 from __future__ import absolute_import, print_function, unicode_literals
 
+from collections import OrderedDict
+from contextlib import contextmanager
+import mmap
+import os
 from os import remove
 import re
+import time
 
+from .atomic import atomic_write
+from .cache import CACHE
 from .dir import Dir
-from .node import Node
+from .index import ParseIndex, findall_value
+from .node import Node, remember_exists, shared_node
+from .render import render_many
+from .sections import splice_section
+from .template import CompiledTemplate
 from ..input import prompt
 from ..meta import setdynattr
 
@@ -52,6 +63,16 @@ class File(Node):
     getting and setting a value in self.data based on the regex.
 
     :param atts: See notes in node.py
+    :param atts['mmap']: (Optional) If True, find(), findall(), and Parsable
+        attributes search a read-only memory map of the file (rather than
+        reading it into memory) for as long as self.data is empty.
+    :param atts['atomic']: (Optional) If True, overwriting the file replaces it
+        atomically (see atomic.py) instead of truncating it in place.
+    :param atts['cache']: (Optional) If True, read() returns the file's
+        contents from a process-wide cache (see cache.py), shared with every
+        other File of the same path, and checks with a stat() on every read
+        that the file hasn't changed since (rereading it if it has). Data
+        changed in memory, but not yet written, is still returned as is.
 
     Usage::
 
@@ -67,9 +88,17 @@ class File(Node):
 
     def __init__(self, atts=None):
         """Initializes a new File instance."""
+        self.mmap = self.atomic = self.cache = False
+        self.fd = None  # Set while the file is opened()
+        self._disk_data = None  # The data last read from (or written to) disk
+        self._stale = False  # Set when a watched file changes on disk
         super(File, self).__init__(atts)
         self.data = '' # Initialize data as an empty string.
 
+    def __contains__(self, string):
+        """Returns True if string is in the file (see find())."""
+        return self.find(string) >= 0
+
     def __str__(self):
         """Returns a string with the path."""
         if not self.path:
@@ -99,17 +128,30 @@ class File(Node):
         # Create the file
         try:
             file_handle = open(self.path, 'w')
+        except Exception as error:  # pylint: disable=broad-except
+            print('[ERROR]')
+            print(error)
+            return False
+        try:
             if data:  # If data was passed or data exists, write it.
                 self.data = data
             if getattr(self, 'data', None):
                 self.write(self.data, False, file_handle)
-            file_handle.close()
+            remember_exists(self.path, True)
             print('[OK]')
+            # Set the perms and owner through the open handle, so they are set
+            # on the file that was just created (not whatever is at the path).
+            outer_fd, self.fd = self.fd, file_handle.fileno()
+            try:
+                return all([self.chmod(), self.chown()])
+            finally:
+                self.fd = outer_fd
         except Exception as error:  # pylint: disable=broad-except
             print('[ERROR]')
             print(error)
             return False
-        return all([self.chmod(), self.chown()])
+        finally:
+            file_handle.close()
 
     def remove(self, ask=True):  # pylint: disable=arguments-differ
         """Removes the file/directory."""
@@ -120,6 +162,7 @@ class File(Node):
             return True
         if not ask or prompt('Remove ' + self.path + '?'):
             remove(self.path)
+            remember_exists(self.path, False)
             return True
 
     def read(self, flush_memory=False):
@@ -127,9 +170,22 @@ class File(Node):
            If the file doesn't exist, returns an empty string.
 
            Note that method first attempts to return the contents as in memory
-           (which might differ from what is on disk)."""
+           (which might differ from what is on disk). In cache mode, the
+           contents in memory are only returned if they were changed in memory;
+           otherwise they are checked against the file (see cache.py). When
+           the file is watched (see watch()) and has changed on disk, the
+           contents in memory are read again, unless they were changed in
+           memory."""
+        # pylint: disable=attribute-defined-outside-init
+        if self._stale:
+            self._stale = False
+            if self.data is self._disk_data:
+                flush_memory = True
         if flush_memory:  # Empty memory to force reading from disk
             self.data = ''
+        if self.cache and self.path and (self.data == '' or self.data is self._disk_data):
+            self.data = self._disk_data = CACHE.read(self.path) or ''
+            return self.data
         if self.data != '':
             return self.data
         if not self.exists():  # If no data in memory and doesn't exist,
@@ -137,17 +193,121 @@ class File(Node):
             return self.data
         try:  # Otherwise, try to read the file
             file_handle = open(self.path, 'r')
-            self.data = file_handle.read()
+            self.data = self._disk_data = file_handle.read()
             file_handle.close()
             return self.data
         except Exception:  # pylint: disable=broad-except
             print('[ERROR]')
             raise
 
+    def _changed(self, path):
+        """Marks the data in memory as stale when the file changes on disk
+        (see watch()). Called from the watcher's thread, so the data itself
+        is left to read(), which only drops it if it wasn't changed in memory."""
+        self._stale = True  # pylint: disable=attribute-defined-outside-init
+
     def readlines(self):
         """Returns the contents of the file as a list for iteration."""
         return self.read().split('\n')
 
+    def iterlines(self):
+        """A generator that streams the lines of the file from disk.
+           Yields the same lines as readlines() (without their trailing
+           newlines), but reads through a buffered handle, so memory stays
+           constant regardless of the file's size. self.data is neither used
+           nor populated. If the file doesn't exist, nothing is yielded."""
+        if not self.exists():
+            return
+        with open(self.path, 'r') as file_handle:
+            line = ''
+            for line in file_handle:
+                yield line[:-1] if line.endswith('\n') else line
+            if line == '' or line.endswith('\n'):
+                yield ''  # Match readlines(): text after the last '\n'
+
+    def iter_chunks(self, size=65536):
+        """A generator that streams the contents of the file from disk in
+           chunks of (at most) size characters. self.data is neither used nor
+           populated. If the file doesn't exist, nothing is yielded."""
+        if not self.exists():
+            return
+        with open(self.path, 'r') as file_handle:
+            while True:
+                chunk = file_handle.read(size)
+                if not chunk:
+                    return
+                yield chunk
+
+    @contextmanager
+    def opened(self, write=False):
+        """A context manager that opens the file and yields its fd. While it
+        is open, chmod(), chown(), check(), write(), and the actual_* properties
+        use the fd (fchmod(), fchown(), fstat()) instead of resolving the path
+        again. If write is True, the file is opened for reading and writing
+        (and created if it doesn't exist). If the file is already opened, its
+        fd is reused."""
+        if self.fd is not None:
+            yield self.fd
+            return
+        if write:
+            # With perms, it is only opened to the owner until chmod()
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600 if self.perms else 0o666)
+        else:
+            self.fd = os.open(self.path, os.O_RDONLY)
+        try:
+            yield self.fd
+        finally:
+            fd, self.fd = self.fd, None
+            os.close(fd)
+
+    @contextmanager
+    def mapped(self):
+        """A context manager that yields a read-only memory map of the file.
+           Yields None if the file doesn't exist or is empty (an empty file
+           cannot be mapped). The map is closed on exit."""
+        if not self.exists():
+            yield None
+            return
+        with open(self.path, 'rb') as file_handle:
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                yield None
+                return
+            buf = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield buf
+            finally:
+                buf.close()
+
+    def _use_mmap(self):
+        """Returns True if searches should run over a memory map."""
+        return self.mmap and self.data == ''
+
+    def find(self, string, start=0):
+        """Returns the lowest index of string in the file or -1 if it isn't
+           found. In mmap mode, the index is a byte offset."""
+        if not self._use_mmap():
+            return self.read().find(string, start)
+        with self.mapped() as buf:
+            if buf is None:
+                return -1
+            return buf.find(string.encode('utf-8'), start)
+
+    def findall(self, regex):
+        """Returns re.findall(regex) run over the contents of the file.
+           In mmap mode, the regex is run over the memory map and the matches
+           are decoded; self.data is not populated. A bytes regex only
+           matches the same as the str regex when both the regex and the file
+           are ASCII, so otherwise the map is decoded and searched as a str."""
+        if not self._use_mmap():
+            return re.findall(regex, self.read())
+        with self.mapped() as buf:
+            if buf is None:
+                return []
+            bytes_regex = _bytes_regex(regex)
+            if bytes_regex is None or _NON_ASCII.search(buf):
+                return re.findall(regex, buf[:].decode('utf-8'))
+            return [_decode(result) for result in bytes_regex.findall(buf)]
+
     def write(self, data=None, append=True, handle=None):
         """Writes data to the file."""
         # pylint: disable=attribute-defined-outside-init
@@ -163,20 +323,49 @@ class File(Node):
             if handle: # When passed a handle, rely on the caller to open.close the file
                 file_handle = handle
                 file_handle.write(data)
+            elif self.fd is not None:  # Opened with opened(write=True)
+                if append:
+                    os.lseek(self.fd, 0, os.SEEK_END)
+                else:
+                    os.lseek(self.fd, 0, os.SEEK_SET)
+                    os.ftruncate(self.fd, 0)
+                encoded = data.encode('utf-8') if not isinstance(data, bytes) else data
+                while encoded:
+                    encoded = encoded[os.write(self.fd, encoded):]
+            elif self.atomic and not append:
+                atomic_write(self.path, data, self.perms)
             else:
                 flags = 'a' if append else 'w'
                 file_handle = open(self.path, flags)
                 file_handle.write(data)
                 file_handle.close()
+            self._disk_data = self.data  # Written, so read() can check the file again
             return True
         except Exception:  # pylint: disable=broad-except
             print('[ERROR]')
             return False
 
+    def atomic_write(self, data=None, sync=True, sync_dir=True, batch=None):
+        """Atomically replaces the file with data (or self.data).
+        The directory fsync can be deferred to an FsyncBatch (see atomic.py)."""
+        # pylint: disable=attribute-defined-outside-init
+        if data:
+            self.data = data
+        elif self.data == '':
+            raise UnboundLocalError('Must pass data to atomic_write method of File class.')
+        atomic_write(self.path, self.data, self.perms, sync, sync_dir, batch)
+        self._disk_data = self.data
+        return True
+
     def append(self, data, handle=None):
         """Appends the file with data. Just a wrapper."""
         return self.write(data, True, handle)
 
+    def appender(self, max_bytes=65536, max_delay=1.0):
+        """Returns an Appender for making many appends to the file through a
+        single open handle. Use it as a context manager to flush on exit."""
+        return Appender(self, max_bytes, max_delay)
+
     def overwrite(self, data, handle=None):
         """Overwrites the file with data. Just a wrapper."""
         return self.write(data, False, handle)
@@ -194,8 +383,123 @@ class File(Node):
 
     @property
     def parent_dir(self):
-        """Returns a Dir instance representing the parent directory."""
-        return Dir(self.parent_node.get_atts())
+        """Returns a Dir instance representing the parent directory. Like
+        parent_node, it is remembered and shared with the other nodes in the
+        same directory."""
+        cached = getattr(self, '_parent_dir', None)
+        if cached is not None and cached[0] == self.path:
+            return cached[1]
+        parent = shared_node(Dir, self.parent_node.get_atts())
+        self._parent_dir = (self.path, parent)  # pylint: disable=attribute-defined-outside-init
+        return parent
+
+
+class Appender(object):
+    """Buffers appends to a File and writes them through one open handle.
+
+    The buffer is written out once it holds max_bytes (characters), or on the
+    first append after max_delay seconds have passed since the last write
+    (None disables this), and when the Appender is flushed or closed. If the
+    File's data is in memory, it is kept in step with what is written.
+
+    :param the_file: The File to append to.
+    :param max_bytes: The size of the buffer.
+    :param max_delay: The longest (in seconds) an append waits in the buffer,
+        checked on each append.
+
+    Usage::
+
+        >>> from ext_pylib.files import File
+
+        >>> log = File({'path' : '/the/path/log'})
+        >>> with log.appender() as appender:
+        ...     for line in lines:
+        ...         appender.append(line)
+    """
+
+    def __init__(self, the_file, max_bytes=65536, max_delay=1.0):
+        """Initializes a new Appender."""
+        self.file = the_file
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._buffer, self._size = [], 0
+        self._handle = None
+        self._written_at = time.time()
+
+    def __enter__(self):
+        """Returns the Appender."""
+        return self
+
+    def __exit__(self, *args):
+        """Flushes the buffer and closes the file."""
+        self.close()
+
+    def append(self, data):
+        """Adds data to the buffer, writing it out if a threshold is met."""
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self.max_bytes or \
+                (self.max_delay is not None and time.time() - self._written_at >= self.max_delay):
+            self.flush()
+
+    write = append
+
+    def flush(self):
+        """Writes out the buffer."""
+        if self._buffer:
+            data = ''.join(self._buffer)
+            self._buffer, self._size = [], 0
+            if self._handle is None:
+                self._handle = open(self.file.path, 'a')
+            self._handle.write(data)
+            self._handle.flush()
+            if self.file.data != '':  # Keep data that is in memory accurate
+                self.file.data += data
+        self._written_at = time.time()
+
+    def close(self):
+        """Flushes the buffer and closes the handle."""
+        self.flush()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def _bytes_regex(regex):
+    """Returns a compiled bytes version of regex (a string or compiled
+    pattern) for searching a memory map, or None if regex isn't ASCII (and so
+    can't match bytes the same way). These are cached by pattern."""
+    if not hasattr(regex, 'pattern'):
+        regex = re.compile(regex)
+    key = (regex.pattern, regex.flags)
+    if key not in _BYTES_REGEXES:
+        try:
+            _BYTES_REGEXES[key] = re.compile(regex.pattern.encode('ascii'), regex.flags & ~re.UNICODE)
+        except UnicodeError:
+            _BYTES_REGEXES[key] = None
+    return _BYTES_REGEXES[key]
+
+_BYTES_REGEXES = {}
+_NON_ASCII = re.compile(b'[\x80-\xff]')
+
+
+def _mtime(path):
+    """Returns the mtime (in nanoseconds, if possible) of path, or None if
+    there isn't a path or nothing is there."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return getattr(stat, 'st_mtime_ns', stat.st_mtime)
+
+
+def _decode(result):
+    """Decodes a findall() result (bytes or a tuple of bytes)."""
+    if isinstance(result, tuple):
+        return tuple(group.decode('utf-8') for group in result)
+    return result.decode('utf-8')
 
 
 class Section(object):
@@ -216,12 +520,13 @@ class Section(object):
     """
 
     def is_applied(self, data):
-        """Returns true if data has this section applied exactly."""
+        """Returns true if data has this section applied exactly.
+        data may also be a File (see File.mmap)."""
         return self.read() in data
 
     def is_in(self, data):
         """Returns true if data has the section, whether or not it is applied
-        exactly."""
+        exactly. data may also be a File (see File.mmap)."""
         # pylint: disable=attribute-defined-outside-init
         self._start_pos = data.find(self.start_section)
         self._end_pos = data.find(self.end_section)
@@ -234,6 +539,8 @@ class Section(object):
 
     def apply_to(self, data, overwrite=False):
         """Returns a string in which the section is applied to the data."""
+        if isinstance(data, File):
+            data = data.read()
         if self.is_applied(data):
             return data
         if self.is_in(data):
@@ -245,24 +552,46 @@ class Section(object):
         else:
             return data + '\n' + self.read() + '\n'
 
+    def splice_into(self, target, output=None, overwrite=False):
+        """Applies the section to the target file (a File or path) without
+        reading the target into memory, and atomically writes the result to
+        output (by default, the target). Returns True if the section changed
+        the target. See splice_section() in sections.py."""
+        return splice_section(self, target, output, overwrite)
+
     @property
     def start_section(self):
         """Returns the string that denotes the start of the section."""
-        if self.read() == '':
-            raise EOFError('Section file has no data')
-        return self.readlines()[0]
+        return self._section_markers()[0]
 
     @property
     def end_section(self):
         """Returns the string that denotes the end of the section."""
-        if self.read() == '':
-            raise EOFError('Section file has no data')
-        lines = self.readlines()
-        if len(lines) < 2:
+        end = self._section_markers()[1]
+        if end is None:
             raise ValueError('Not a valid section file.')
-        if lines[-1] != '':  # If the last line is blank, use the line before it.
-            return lines[-1]
-        return lines[-2]
+        return end
+
+    def _section_markers(self):
+        """Returns a tuple of the start and end (None if there isn't one) lines
+        of the section. They are cached for as long as read() returns the same
+        data, so the section isn't split into lines every time."""
+        # pylint: disable=attribute-defined-outside-init
+        data = self.read()
+        cache = getattr(self, '_markers', None)
+        if cache is not None and cache[0] is data:
+            return cache[1]
+        if data == '':
+            raise EOFError('Section file has no data')
+        start = data.split('\n', 1)[0]
+        if '\n' not in data:
+            end = None
+        elif data.endswith('\n'):  # If the last line is blank, use the line before it.
+            end = data[:-1].rsplit('\n', 1)[-1]
+        else:
+            end = data.rsplit('\n', 1)[-1]
+        self._markers = (data, (start, end))
+        return self._markers[1]
 
 
 class SectionFile(Section, File):
@@ -288,11 +617,35 @@ class Template(object):  # pylint: disable=too-few-public-methods
 
     def apply_using(self, placeholders):
         """Returns a string with placeholders replaced.
-        Takes a dict of placeholders and values to replace."""
-        data = self.read() # temp, throw-away (after returning) data value
-        for placeholder, value in list(placeholders.items()):
-            data = data.replace(placeholder, value)
-        return data
+        Takes a dict of placeholders and values to replace. The replacements
+        are made in a single pass by a compiled template (see compile())."""
+        return self.compile(placeholders).render(placeholders)
+
+    def render_many(self, jobs, workers=4, perms=None, sync=True):
+        """Renders the template for each (placeholders, path) tuple in jobs
+        and atomically writes each result to its path, on a pool of threads.
+        Returns RenderStats (see render.py)."""
+        return render_many(self, jobs, workers, perms, sync)
+
+    def compile(self, placeholders):
+        """Returns a CompiledTemplate of the template for the placeholders
+        (see template.py). Compiled templates are cached (one per set of
+        placeholders) until the data changes. For a file, the cache is also
+        dropped when the file's mtime changes; if the data in memory hasn't
+        been changed since it was read, it is read again."""
+        # pylint: disable=attribute-defined-outside-init
+        cache = getattr(self, '_compiled', None)
+        mtime = _mtime(getattr(self, 'path', None))
+        if cache is not None and cache[1] != mtime and getattr(self, 'data', None) is cache[0]:
+            self.read(True)  # The file changed on disk
+        data = self.read()
+        if cache is None or cache[0] is not data or cache[1] != mtime:
+            cache = self._compiled = (data, mtime, {})
+        keys = frozenset(placeholders)
+        compiled = cache[2].get(keys)
+        if compiled is None:
+            compiled = cache[2][keys] = CompiledTemplate(data, keys)
+        return compiled
 
 
 class TemplateFile(Template, File):
@@ -317,6 +670,7 @@ class Parsable(object):
         >>> a_file.htdocs
         'example.com'
     """
+    indexed = False  # If True, attributes use a ParseIndex (see index.py)
 
     def setup_parsing(self, regexes=None):
         """Takes a dict of name:regex to parse self.data with.
@@ -355,27 +709,106 @@ class Parsable(object):
                 regex, mask = regex_tuple[0], '{}'
         else:
             regex, mask = regex_tuple, '{}'
+        regex = re.compile(regex)  # Compiled once per attribute
+        if not hasattr(self, '_parse_regexes'):
+            self._parse_regexes = OrderedDict()  # pylint: disable=attribute-defined-outside-init
+        self._parse_regexes[attribute] = regex
+        self._parse_combined = self._parse_index = None  # pylint: disable=attribute-defined-outside-init
+
         def getter_func(self):
             """Parsable dynamic attribute getter function."""
-            results = re.findall(regex, self.read())
-            if not results:
-                return None
-            elif len(results) == 1:
-                return results[0]
-            return results
+            if getattr(self, 'mmap', False) and not self.data:
+                results = self.findall(regex)  # Searches a memory map
+            elif self.indexed:
+                results = self.get_parse_index().findall(attribute, regex, self.read())
+            else:
+                results = regex.findall(self.read())
+            return _parsed_value(results)
 
         def setter_func(self, value):
             """Parsable dynamic attribute setter function.
             Note that this is only changing the value in memory.  You must call
             write()."""
-            if not re.findall(regex, self.read()):
+            if self.indexed:
+                self.data = self.get_parse_index().sub(attribute, regex, self.read(), mask.format(value),
+                                                       '\n' + mask.format(value))
+            elif not regex.search(self.read()):
                 # If the value doesn't exist, add it to the end of data
                 self.data = self.data + '\n' + mask.format(value)
             else:  # otherwise just change it everywhere it exists
-                self.data = re.sub(regex, mask.format(value), self.read())
+                self.data = regex.sub(mask.format(value), self.read())
 
         setdynattr(self, attribute, getter_func, setter_func)
 
+    def get_parse_index(self):
+        """Returns the ParseIndex (see index.py) of the parsable attributes."""
+        if getattr(self, '_parse_index', None) is None:
+            self._parse_index = ParseIndex()  # pylint: disable=attribute-defined-outside-init
+        return self._parse_index
+
+    def parse_all(self):
+        """Returns a dict of every parsable attribute and its value (as the
+        attribute itself would return it) from a single scan of the data.
+
+        The regexes are combined into one lookahead alternation, so the scan
+        stops at every position where any of them matches. There, each regex
+        is matched in turn (unless its own previous match covers the
+        position), so overlapping matches of different regexes are all
+        found, as separate findall()s would find them. If the regexes can't be
+        combined (e.g. they use backreferences or different flags), each is
+        run in turn over the data instead."""
+        regexes = getattr(self, '_parse_regexes', {})
+        if getattr(self, '_parse_combined', None) is None:
+            self._parse_combined = (_combine_regexes(regexes),)  # pylint: disable=attribute-defined-outside-init
+        combined = self._parse_combined[0]
+        data = self.read()
+        if combined is None:
+            return dict((attribute, _parsed_value(regex.findall(data)))
+                        for attribute, regex in regexes.items())
+        results = dict((attribute, []) for attribute in regexes)
+        ends = dict((attribute, 0) for attribute in regexes)
+        for position in combined.finditer(data):
+            position = position.start()
+            for attribute, regex in regexes.items():
+                if position < ends[attribute]:
+                    continue  # Inside this regex's previous match
+                match = regex.match(data, position)
+                if match is not None:
+                    results[attribute].append(findall_value(regex, match))
+                    ends[attribute] = match.end()
+        return dict((attribute, _parsed_value(values)) for attribute, values in results.items())
+
+def _parsed_value(results):
+    """Returns a list of findall() results the way a Parsable attribute does:
+    None if empty, the result if only one, otherwise the list."""
+    if not results:
+        return None
+    elif len(results) == 1:
+        return results[0]
+    return results
+
+
+def _combine_regexes(regexes):
+    """Combines an ordered dict of attribute: compiled regex into a single
+    alternation of lookaheads, which matches (without consuming anything)
+    wherever any of the regexes match. Returns None if the regexes can't
+    safely be combined."""
+    if not regexes:
+        return None
+    flags = set(regex.flags for regex in regexes.values())
+    if len(flags) > 1 or any(_BACKREFERENCE.search(regex.pattern) for regex in regexes.values()):
+        return None
+    try:
+        return re.compile('(?=' + '|'.join('(?:' + regex.pattern + ')' for regex in regexes.values()) + ')',
+                          flags.pop())
+    except re.error:  # e.g. the same named group in two regexes
+        return None
+
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
 
 class ParsableFile(Parsable, File):
-    """A File class implementing the Parsable Mixin."""
+    """A File class implementing the Parsable Mixin.
+    Attributes are read from and written through an index of the matches in
+    the data (see index.py), so only the first read scans the whole file."""
+    indexed = True
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             index.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.index
+~~~~~~~~~~~~~~~~~~~~~
+
+A match-offset index used by ParsableFile so that reading an attribute doesn't
+rescan the whole file and setting one doesn't rerun re.sub() over it.
+
+The first time an attribute is read, its regex is run over the data once and
+the matches (with their offsets) are kept. Setting an attribute splices the
+new value into just the matched spans (in one join) and then updates the
+index incrementally: matches outside of the edited lines are shifted by the
+change in length and only the edited lines are rescanned.
+
+Rescanning just the edited lines is only correct for regexes whose matches
+can't span lines (the usual case for directives in a config file). Regexes
+that might (e.g. ones using '\\s', '^', '$', lookarounds, the DOTALL or
+MULTILINE flags, or any way of spelling a newline or a control character,
+such as '\\x0a' or '[\\x00-z]') are simply dropped from the index on every
+edit and rescanned in full the next time they are read. The check errs on
+the side of dropping.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from bisect import bisect_left, bisect_right
+import re
+
+
+# Constructs that could let a match span lines or depend on text outside of
+# the line it is on: classes and escapes that match '\n', escapes that can
+# spell it (or start a range that includes it, like '[\t-z]'), literal
+# control characters, anchors and lookarounds. A negated character class is
+# fine if it excludes '\n'.
+_NOT_LINE_LOCAL = re.compile(r'\\[sWDnAZabtxuUN0-7]|[\x00-\x1f]|\[\^(?![^\]]*\\n)|[\^$]|\(\?(?!:|P<)')
+
+
+def is_line_local(regex):
+    """Returns True if no match of the compiled regex can span lines."""
+    if regex.flags & (re.DOTALL | re.MULTILINE):
+        return False
+    return not _NOT_LINE_LOCAL.search(regex.pattern)
+
+
+def findall_value(regex, match):
+    """Returns what re.findall() would return for match."""
+    if regex.groups == 0:
+        return match.group(0)
+    if regex.groups == 1:
+        group = match.group(1)
+        return '' if group is None else group
+    return match.groups('')
+
+
+class ParseIndex(object):
+    """An index of the matches of a set of regexes in a string of data.
+
+    Each attribute is indexed (with the compiled regex passed in) the first
+    time it is read. The index is tied to one string object. When it is
+    handed a different one (e.g. after reading the file again), it starts
+    over.
+    """
+
+    def __init__(self):
+        """Initializes a new, empty ParseIndex."""
+        self.data = None
+        self.matches = {}
+
+    def _sync(self, data):
+        """Starts over if data isn't the string that was indexed."""
+        if data is not self.data:
+            self.data = data
+            self.matches = {}
+
+    def _matches(self, attribute, regex):
+        """Returns the list of (start, end, match) for attribute."""
+        if attribute not in self.matches or self.matches[attribute][0] is not regex:
+            self.matches[attribute] = (regex, [(match.start(), match.end(), match)
+                                               for match in regex.finditer(self.data)])
+        return self.matches[attribute][1]
+
+    def findall(self, attribute, regex, data):
+        """Returns re.findall(regex, data) for attribute."""
+        self._sync(data)
+        return [findall_value(regex, match) for _, _, match in self._matches(attribute, regex)]
+
+    def sub(self, attribute, regex, data, template, append):
+        """Returns data with every match of attribute's regex replaced with
+        template (as re.sub() would). If there are no matches, append is
+        added to the end of the data instead. The index is updated to point
+        at the returned string."""
+        self._sync(data)
+        matches = self._matches(attribute, regex)
+        if matches:
+            edits = [(start, end, match.expand(template)) for start, end, match in matches]
+        else:
+            edits = [(len(data), len(data), append)]
+
+        pieces, position = [], 0
+        for start, end, replacement in edits:
+            pieces.append(data[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(data[position:])
+        new_data = ''.join(pieces)
+
+        self._update(data, new_data, edits)
+        return new_data
+
+    def _update(self, old, new, edits):
+        """Updates the index after edits turned old into new."""
+        # Each edit's lines (in old) make a window; merge overlapping ones.
+        windows = []
+        for start, end, _ in edits:
+            line_start = old.rfind('\n', 0, start) + 1
+            line_end = old.find('\n', end)
+            line_end = len(old) if line_end < 0 else line_end + 1
+            if windows and line_start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], line_end)
+            else:
+                windows.append([line_start, line_end])
+
+        starts, ends, shifts, shift = [], [], [0], 0
+        for start, end, replacement in edits:
+            shift += len(replacement) - (end - start)
+            starts.append(start)
+            ends.append(end)
+            shifts.append(shift)
+
+        def moved(position):
+            """Maps an offset in old (outside of any edit) to one in new."""
+            return position + shifts[bisect_right(ends, position)]
+
+        # A window starts before (and so isn't moved by) the edits inside it
+        new_windows = [(start + shifts[bisect_left(starts, start)], moved(end) if end < len(old) else len(new))
+                       for start, end in windows]
+        self.data = new
+
+        for attribute in list(self.matches):
+            regex, matches = self.matches[attribute]
+            if not is_line_local(regex):
+                del self.matches[attribute]
+                continue
+            updated, window = [], 0
+            for start, end, match in matches:
+                # Emit the rescans of any windows that come before this match
+                while window < len(windows) and windows[window][1] <= start and \
+                        not (windows[window][1] == start == len(old)):
+                    updated.extend(self._rescan(regex, new_windows[window]))
+                    window += 1
+                if window < len(windows) and windows[window][0] <= start:
+                    continue  # Inside an edited window; it will be rescanned
+                updated.append((moved(start), moved(end), match))
+            for new_window in new_windows[window:]:
+                updated.extend(self._rescan(regex, new_window))
+            self.matches[attribute] = (regex, updated)
+
+    def _rescan(self, regex, window):
+        """Returns the matches of regex in window (of self.data). A match that
+        starts at the end of the window belongs to the next line."""
+        start, end = window
+        return [(match.start(), match.end(), match)
+                for match in regex.finditer(self.data, start, end)
+                if match.start() < end or end == len(self.data)]
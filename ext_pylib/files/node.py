@@ -18,11 +18,144 @@ class respectively.
 
 from __future__ import absolute_import, print_function, unicode_literals
 
-import grp
+import bisect
+from contextlib import contextmanager
 import os
-import pwd
+import re
+import threading
+import weakref
+
+from .verify import verify_node
+from .watch import get_watcher
+from ..user import get_current_username, get_current_groupname, getpwnam, getpwuid, getgrnam, getgrgid
+
+
+# Any character that isn't allowed in a path
+_INVALID_CHAR = re.compile(r'[^-_.() a-zA-Z0-9/]')
+_INVALID_BATCH_CHAR = re.compile(r'[^-_.() a-zA-Z0-9/\0]')
+_REPEATED_SLASHES = re.compile(r'/{2,}')
+
+
+def normalize_path(path):
+    """Validates path and returns it with any repeated slashes collapsed.
+    Raises ValueError if path is empty or has characters that aren't allowed."""
+    # Check for empty string
+    if path == '':
+        raise ValueError('"path" cannot be set to an empty string in an file.Node class.')
+    # Check for valid characters
+    if _INVALID_CHAR.search(path):
+        raise ValueError('"' + path + '" is not allowed as an file.Node.')
+    # Clean path of extra slashes
+    if '//' in path:
+        path = _REPEATED_SLASHES.sub('/', path)
+    return path
+
+
+def normalize_paths(paths):
+    """Returns a list of the paths, validated and normalized (see
+    normalize_path()). Raises ValueError on the first path that isn't valid.
+
+    The paths are joined (with NUL, which no valid path contains) so that
+    validating and collapsing slashes are each one regex pass over the batch.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    joined = '\0'.join(paths)
+    if '' in paths or joined.count('\0') != len(paths) - 1 or _INVALID_BATCH_CHAR.search(joined):
+        return [normalize_path(path) for path in paths]  # Raises for the bad path
+    if '//' in joined:
+        joined = _REPEATED_SLASHES.sub('/', joined)
+    return joined.split('\0')
+
+
+# Interned parent nodes (see shared_node()), keyed by (class, path)
+_SHARED = weakref.WeakValueDictionary()
+_SHARED_LOCK = threading.Lock()
+
+# The per-thread memo of exists() results used inside of exists_batch()
+_EXISTS = threading.local()
+
+
+class _ExistsMemo(dict):
+    """The exists() results of an exists_batch(): a dict of path to True or
+    False that also keeps its paths sorted, so that the paths under a
+    directory can be found without looking at every path."""
+
+    def __init__(self):
+        """Initializes a new, empty _ExistsMemo."""
+        super(_ExistsMemo, self).__init__()
+        self._sorted = []
+
+    def __setitem__(self, path, exists):
+        """Remembers whether path exists."""
+        if path not in self:
+            bisect.insort(self._sorted, path)
+        super(_ExistsMemo, self).__setitem__(path, exists)
+
+    def forget_under(self, directory):
+        """Forgets every path under directory (which ends in '/')."""
+        start = bisect.bisect_left(self._sorted, directory)
+        end = start
+        while end < len(self._sorted) and self._sorted[end].startswith(directory):
+            del self[self._sorted[end]]
+            end += 1
+        del self._sorted[start:end]
+
+
+def shared_node(cls, atts):
+    """Returns the shared instance of cls for atts['path'], creating it (with
+    atts) if there isn't one. Instances are only kept while something holds
+    a reference to them. Used for parent directories, so that nodes under
+    the same directory share one parent object."""
+    key = (cls, atts['path'])
+    node = _SHARED.get(key)
+    if node is None:
+        node = cls(atts)
+        with _SHARED_LOCK:
+            node = _SHARED.setdefault(key, node)
+    return node
+
+
+@contextmanager
+def exists_batch():
+    """Within the block, Node.exists() checks each path on disk only once.
+    The results are remembered (and updated when nodes are created or
+    removed through their create() and remove() methods).
+
+    Usage::
 
-from ..user import get_current_username, get_current_groupname
+        >>> from ext_pylib.files import exists_batch
+
+        >>> with exists_batch():
+        ...     for a_file in files:  # Each parent directory is checked once
+        ...         a_file.create()
+    """
+    outer = getattr(_EXISTS, 'memo', None)
+    if outer is None:
+        _EXISTS.memo = _ExistsMemo()
+    try:
+        yield
+    finally:
+        if outer is None:
+            _EXISTS.memo = None
+
+
+def remember_exists(path, exists):
+    """Updates the exists_batch() memo (if there is one) after path was
+    created (exists=True) or removed (exists=False)."""
+    memo = getattr(_EXISTS, 'memo', None)
+    if memo is None:
+        return
+    if exists:  # Its ancestors were created along with it
+        parts = path.rstrip('/').split('/')[:-1]
+        for index in range(1, len(parts) + 1):
+            ancestor = '/'.join(parts[:index]) + '/'
+            if memo.get(ancestor) is False:
+                memo[ancestor] = True
+    else:  # Its descendants were removed along with it
+        memo.forget_under(path.rstrip('/') + '/')
+    memo[path] = exists
 
 
 class Node(object):
@@ -120,10 +253,12 @@ class Node(object):
         raise NotImplementedError('[ERROR] Cannot call method on file.Node. It is an abstract class.')
 
     def chmod(self, perms=None):
-        """Sets the permissions on the file/directory."""
+        """Sets the permissions on the file/directory (through its fd, if it
+        has one open)."""
         if not self.path:
             return True
-        if not self.exists():
+        fd = getattr(self, 'fd', None)
+        if fd is None and not self.exists():
             raise IOError(self.path + ' does not exist. Cannot set owner and permissions. [!]')
         if not perms:
             perms = self.perms
@@ -132,7 +267,10 @@ class Node(object):
         print('Setting permissions on ' + self.path + ' to "' + \
               self.perms_as_string(perms)  + '"...', end=' ')
         try:
-            os.chmod(self.path, perms) # Be sure to use leading '0' as chmod takes an octal
+            if fd is not None:
+                os.fchmod(fd, perms)
+            else:
+                os.chmod(self.path, perms) # Be sure to use leading '0' as chmod takes an octal
             print('[OK]')
             return True
         except Exception as error:  # pylint: disable=broad-except
@@ -141,10 +279,12 @@ class Node(object):
             return False
 
     def chown(self, owner=None, group=None):
-        """Sets the owner and group of the directory."""
+        """Sets the owner and group of the directory (through its fd, if it
+        has one open)."""
         if not self.path:
             return True
-        if not self.exists():
+        fd = getattr(self, 'fd', None)
+        if fd is None and not self.exists():
             raise IOError(self.path + ' does not exist. Cannot set owner and permissions. [!]')
         if not owner:
             owner = self.owner
@@ -156,9 +296,12 @@ class Node(object):
                 group = 'nogroup' if owner == 'nobody' else get_current_groupname()
         print('Setting owner on ' + self.path + ' to "' + owner  + ':' + group + '"...', end=' ')
         try:
-            uid = pwd.getpwnam(owner).pw_uid
-            gid = grp.getgrnam(group).gr_gid
-            os.chown(self.path, uid, gid)
+            uid = getpwnam(owner).pw_uid
+            gid = getgrnam(group).gr_gid
+            if fd is not None:
+                os.fchown(fd, uid, gid)
+            else:
+                os.chown(self.path, uid, gid)
             print('[OK]')
             return True
         except Exception as error:  # pylint: disable=broad-except
@@ -167,9 +310,15 @@ class Node(object):
             return False
 
     def exists(self):
-        """Returns true if this directory exists on disk."""
+        """Returns true if this directory exists on disk. Inside of an
+        exists_batch(), each path is only checked once."""
         if not self.path:
             return False
+        memo = getattr(_EXISTS, 'memo', None)
+        if memo is not None:
+            if self.path not in memo:
+                memo[self.path] = os.path.exists(self.path)
+            return memo[self.path]
         if os.path.exists(self.path):
             return True
         return False
@@ -229,6 +378,50 @@ class Node(object):
         """Runs verify() with the repair flag set."""
         return self.verify(True)
 
+    def check(self, repair=False):
+        """Verifies the file/directory against a single stat snapshot without
+        printing anything. Returns a VerifyResult (see verify.py)."""
+        return verify_node(self, repair)
+
+    def watch(self, callback=None, watcher=None):
+        """Calls callback(node, path) whenever the node changes on disk (for a
+        directory, whenever an entry in it changes; path is the entry). The
+        callbacks are called from the watcher's thread. Watching again
+        replaces the callback.
+
+        :param watcher: The Watcher to use (see watch.py). By default, the one
+            shared by the whole process.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        if not self.path:  # For stubs, just return True
+            return True
+        self.unwatch()
+        watcher = watcher or get_watcher()
+
+        def changed(path):
+            """Called by the watcher when path changes."""
+            self._changed(path)
+            if callback:
+                callback(self, path)
+
+        watcher.watch(self.path, changed)
+        self._watching = (watcher, self.path, changed)
+        return True
+
+    def unwatch(self):
+        """Stops watching the node (see watch())."""
+        # pylint: disable=attribute-defined-outside-init
+        watching = getattr(self, '_watching', None)
+        if watching is not None:
+            watching[0].unwatch(watching[1], watching[2])
+            self._watching = None
+        return True
+
+    def _changed(self, path):
+        """Called when the node (or, for a directory, path in it) changes on
+        disk, before the watch() callback."""
+        pass
+
     @property
     def path(self):
         """Returns the path, if it exists."""
@@ -243,17 +436,7 @@ class Node(object):
             print('[Notice] file.Node was initialized with an empty path.  Continuing as a stub.')
             self._path = None
             return
-        # Check for empty string
-        if path == '':
-            raise ValueError('"path" cannot be set to an empty string in an file.Node class.')
-        # Check for valid characters
-        for char in path:
-            if char not in '-_.() abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789/':
-                raise ValueError('"' + path + '" is not allowed as an file.Node.')
-        # Clean path of extra slashes
-        while "//" in path:
-            path = path.replace('//', '/')
-        self._path = path
+        self._path = normalize_path(path)
 
     @property
     def name(self):
@@ -267,7 +450,18 @@ class Node(object):
 
     @property
     def parent_node(self):
-        """Returns the parent node as a Node object (usually the parent directory)."""
+        """Returns the parent node as a Node object (usually the parent directory).
+        The parent is remembered (for as long as the path doesn't change) and
+        shared with other nodes in the same directory (see shared_node())."""
+        cached = getattr(self, '_parent_node', None)
+        if cached is not None and cached[0] == self.path:
+            return cached[1]
+        parent = self._make_parent_node()
+        self._parent_node = (self.path, parent)  # pylint: disable=attribute-defined-outside-init
+        return parent
+
+    def _make_parent_node(self):
+        """Returns a (shared) Node for the parent of the path."""
         if not self.path:
             return None
         if self.path == '/':  # '/' has no parent
@@ -285,14 +479,21 @@ class Node(object):
         else:
             parent_path = path.rsplit('/', 2)[0] + '/'
 
-        return Node({'path' : parent_path})
+        return shared_node(Node, {'path' : parent_path})
+
+    def _stat(self):
+        """Returns os.stat() of the path (or os.fstat() of the open fd)."""
+        fd = getattr(self, 'fd', None)
+        if fd is not None:
+            return os.fstat(fd)
+        return os.stat(self.path)
 
     @property
     def actual_perms(self):
         """Returns the perms as it is on disk."""
         if not self.path:
             return None
-        return os.stat(self.path).st_mode & 511
+        return self._stat().st_mode & 511
 
     @property
     def perms(self):
@@ -329,7 +530,7 @@ class Node(object):
         """Returns the owner (string) as it is on disk."""
         if not self.path:
             return None
-        return pwd.getpwuid(os.stat(self.path).st_uid).pw_name
+        return getpwuid(self._stat().st_uid).pw_name
 
     @property
     def owner(self):
@@ -345,7 +546,7 @@ class Node(object):
         else:
             try:
                 # Make sure this is a valid user
-                uid = pwd.getpwnam(owner)  # pylint: disable=unused-variable
+                uid = getpwnam(owner)  # pylint: disable=unused-variable
             except KeyError:
                 print('[ERROR] ' + owner + ' is not a valid user.')
                 raise
@@ -356,7 +557,7 @@ class Node(object):
         """Returns the group (string) as it is on disk."""
         if not self.path:
             return None
-        return grp.getgrgid(os.stat(self.path).st_gid).gr_name
+        return getgrgid(self._stat().st_gid).gr_name
 
     @property
     def group(self):
@@ -373,7 +574,7 @@ class Node(object):
         else:
             try:
                 # Make sure this is a valid group
-                gid = grp.getgrnam(group) # pylint: disable=unused-variable
+                gid = getgrnam(group) # pylint: disable=unused-variable
             except KeyError:
                 print('[ERROR] ' + group + ' is not a valid group.')
                 raise
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             render.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.render
+~~~~~~~~~~~~~~~~~~~~~~
+
+Rendering one template to many files. The template is read once and compiled
+once per set of placeholders (see template.py). The outputs are rendered and
+written atomically (see atomic.py) on a pool of threads, with the directory
+fsyncs batched so each output directory is fsync'ed once per batch.
+
+The jobs are taken from the iterable batch_size at a time, so an iterable
+(or generator) of any length can be rendered with bounded memory.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from itertools import islice
+from multiprocessing.pool import ThreadPool
+import time
+
+from .atomic import FsyncBatch, atomic_write
+from .template import CompiledTemplate
+
+
+class RenderStats(object):
+    """The results of a render_many(). `bytes` counts the characters written
+    and `errors` is a list of (path, error) tuples."""
+
+    def __init__(self):
+        """Initializes new, empty RenderStats."""
+        self.rendered = self.bytes = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def __str__(self):
+        """Returns a human readable summary."""
+        return 'Rendered {0} files ({1:.1f} MB) in {2:.2f}s, {3} errors: {4:.0f} renders/s'.format(
+            self.rendered, self.bytes / 1048576.0, self.elapsed, len(self.errors), self.renders_per_second)
+
+    @property
+    def renders_per_second(self):
+        """Returns the number of files rendered per second."""
+        return self.rendered / self.elapsed if self.elapsed else 0.0
+
+
+def render_many(template, jobs, workers=4, perms=None, sync=True, batch_size=256):
+    """Renders template for each (placeholders, path) tuple in jobs and
+    atomically writes the result to path. Returns RenderStats.
+
+    :param template: A Template (e.g. a TemplateFile) or the template as a
+        string.
+    :param jobs: An iterable of (placeholders dict, output path) tuples.
+    :param workers: The number of threads rendering and writing.
+    :param perms: The permissions of the outputs (see atomic_write()).
+    :param sync: If False, nothing is fsync'ed (faster, but not durable).
+    :param batch_size: How many jobs are taken from jobs at a time.
+    """
+    stats = RenderStats()
+    start = time.time()
+    data = template.read() if hasattr(template, 'read') else template
+    compiled = {}  # One CompiledTemplate per set of placeholders
+
+    def render(job):
+        """Pool worker: renders and writes one output. Returns (path, size, error)."""
+        placeholders, path, fsyncs = job
+        try:
+            output = compiled[frozenset(placeholders)].render(placeholders)
+            atomic_write(path, output, perms, sync, sync, fsyncs)
+            return path, len(output), None
+        except (OSError, IOError, KeyError) as error:
+            return path, 0, error
+
+    jobs = iter(jobs)
+    pool = ThreadPool(max(1, workers))
+    try:
+        while True:
+            batch = list(islice(jobs, batch_size))
+            if not batch:
+                break
+            fsyncs = FsyncBatch()
+            batch = [(placeholders, path, fsyncs) for placeholders, path in batch]
+            for placeholders, _, _ in batch:
+                keys = frozenset(placeholders)
+                if keys not in compiled:
+                    compiled[keys] = CompiledTemplate(data, keys)
+            for path, size, error in pool.imap_unordered(render, batch):
+                if error is not None:
+                    stats.errors.append((path, error))
+                else:
+                    stats.rendered += 1
+                    stats.bytes += size
+            if sync:
+                fsyncs.flush()
+    finally:
+        pool.close()
+        pool.join()
+    stats.elapsed = time.time() - start
+    return stats
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             sections.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.sections
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Applying many sections (see Section in file.py) to one target at once.
+Section.apply_to() makes several passes over the target and builds a new copy
+of it for every section. apply_sections() finds the start and end markers of
+every section in a single regex scan of the target and builds the result with
+a single join. The result is the same as calling apply_to() for each section
+in turn.
+
+It also reports which sections changed the target, so that apply_sections_to()
+only writes the target file when something changed.
+
+For targets too large to hold in memory, splice_section() streams the target
+line by line to an AtomicFile (see atomic.py). Only the lines of the section
+already in the target are held in memory, so memory is bounded by the size of
+the section, not the size of the target.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import re
+from shutil import copyfileobj
+
+from .atomic import AtomicFile
+
+
+def find_markers(data, markers):
+    """Returns a dict of each of the markers (strings) to the index of its
+    first occurrence in data (or -1), found with a single scan of data."""
+    positions = dict((marker, -1) for marker in markers)
+    pending = set(marker for marker in positions if marker)
+    if not pending:
+        return positions
+    regex = re.compile('|'.join(re.escape(marker) for marker in sorted(pending, key=len, reverse=True)))
+    for match in regex.finditer(data):
+        marker = match.group()
+        if marker in pending:
+            positions[marker] = match.start()
+            pending.discard(marker)
+            if not pending:
+                break
+    return positions
+
+
+def apply_sections(data, sections, overwrite=False):
+    """Applies each of the sections (Section instances) to data, as apply_to()
+    would. Returns a tuple of (the new data, a list of the sections that
+    changed it). If nothing changed, data itself is returned.
+
+    As apply_to(), a section is already applied if it is anywhere in data,
+    even if its first start marker begins a different copy of it. Only then
+    is data searched for it again. A section is also already applied if it
+    is in a section written earlier in the same call (so a section given
+    twice is only applied once).
+
+    Raises ValueError if a section is in data but isn't applied exactly and
+    overwrite isn't set, if a section's markers are out of order, or if two
+    sections overlap."""
+    sections = list(sections)
+    bodies = [section.read() for section in sections]
+    markers = [(section.start_section, section.end_section) for section in sections]
+    positions = find_markers(data, set(marker for pair in markers for marker in pair))
+
+    edits, appends, changed = [], [], []
+    written = []  # The bodies written so far, as apply_to() in turn would see them
+    for section, body, (start, end) in zip(sections, bodies, markers):
+        start_pos, end_pos = positions[start], positions[end]
+        if any(body in text for text in written):
+            continue  # Already applied earlier in this call
+        written.append(body)
+        if start_pos < 0 and end_pos < 0:
+            appends.append(body)
+            changed.append(section)
+        elif (start_pos >= 0 and data.startswith(body, start_pos)) or body in data:
+            continue  # Already applied (as apply_to(), anywhere in data)
+        elif start_pos < end_pos:
+            if not overwrite:
+                raise ValueError('[WARN] Section already exists, but overwrite flag was not set.')
+            edits.append((start_pos, end_pos + len(end) + 1, body + '\n'))
+            changed.append(section)
+        else:
+            raise ValueError('Data passed to apply_sections() not formatted properly.')
+
+    if not changed:
+        return data, changed
+    pieces, position = [], 0
+    for start, end, replacement in sorted(edits):
+        if start < position:
+            raise ValueError('Sections passed to apply_sections() overlap.')
+        pieces.append(data[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(data[position:])
+    for body in appends:
+        pieces.append('\n' + body + '\n')
+    return ''.join(pieces), changed
+
+
+def apply_sections_to(target, sections, overwrite=False):
+    """Applies each of the sections to the target File and writes it, only if
+    any of them changed it. Returns the list of the sections that changed it."""
+    data, changed = apply_sections(target.read(), sections, overwrite)
+    if changed:
+        target.write(data, False)
+    return changed
+
+
+def _find_section(source, output, start, end):
+    """Copies the lines of source to output up to the section's start marker.
+    Returns a tuple of (the text before the start marker in its line, the
+    section from its start marker through its end marker, the rest of the end
+    marker's line), or None if the section isn't in source (everything was
+    copied)."""
+    for line in source:
+        start_pos, end_pos = line.find(start), line.find(end)
+        if start_pos < 0 <= end_pos or 0 <= end_pos < start_pos:
+            raise ValueError('Data passed to splice_section() not formatted properly.')
+        if start_pos < 0:
+            output.write(line)
+            continue
+        prefix, lines = line[:start_pos], []
+        line = line[start_pos:]
+        while True:
+            end_pos = line.find(end)
+            if end_pos >= 0:
+                end_pos += len(end)
+                lines.append(line[:end_pos])
+                return prefix, ''.join(lines), line[end_pos:]
+            lines.append(line)
+            line = next(source, None)
+            if line is None:  # No end marker
+                raise ValueError('Data passed to splice_section() not formatted properly.')
+    return None
+
+
+def _contains(path, body, size=1048576):
+    """Returns True if body is anywhere in the file at path, read size
+    characters at a time."""
+    tail = ''
+    with open(path, 'r') as source:
+        for chunk in iter(lambda: source.read(size), ''):
+            window = tail + chunk
+            if body in window:
+                return True
+            tail = window[max(0, len(window) - len(body) + 1):]
+    return False
+
+
+def splice_section(section, target, output=None, overwrite=False, perms=None, sync=True):
+    """Applies the section (a Section instance) to the target file, as
+    apply_to() would, streaming the target line by line instead of reading it
+    into memory. The result is written atomically to output (by default, the
+    target itself). Returns True if the section changed the target.
+
+    As apply_to(), the section is already applied if it is anywhere in the
+    target, even after a different copy of it. Only when the first copy isn't
+    the section is the target read a second time to look for it. If the
+    section is already applied and output is the target, the target is left
+    untouched. Raises ValueError as apply_to() does.
+
+    :param target: The path of the target file (or a File).
+    :param output: The path of the result (or a File).
+    :param perms: The permissions of output (see atomic_write()).
+    :param sync: If False, nothing is fsync'ed (faster, but not durable).
+    """
+    target = getattr(target, 'path', target)
+    output = getattr(output, 'path', output) or target
+    body, start, end = section.read(), section.start_section, section.end_section
+    copy_target = False
+    with open(target, 'r') as source:
+        with AtomicFile(output, perms, sync, sync) as destination:
+            try:
+                found = _find_section(source, destination, start, end)
+            except ValueError:
+                if not _contains(target, body):
+                    raise
+                found = False  # Badly formatted, but applied further on
+            if found is None:
+                destination.write('\n' + body + '\n')
+                return True
+            if found and not (found[1] + found[2]).startswith(body) and not _contains(target, body):
+                if not overwrite:
+                    raise ValueError('[WARN] Section already exists, but overwrite flag was not set.')
+                prefix, _, rest = found
+                # As apply_to(), the character after the end marker is replaced
+                destination.write(prefix + body + '\n' + rest[1:])
+                copyfileobj(source, destination)
+                return True
+            # Already applied, so output is a copy of the target
+            if output == target or not found:
+                destination.discard()
+                copy_target = output != target
+            else:
+                destination.write(''.join(found))
+                copyfileobj(source, destination)
+    if copy_target:
+        with open(target, 'r') as source:
+            with AtomicFile(output, perms, sync, sync) as destination:
+                copyfileobj(source, destination)
+    return False
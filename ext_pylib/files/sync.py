@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             sync.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.sync
+~~~~~~~~~~~~~~~~~~~~
+
+Incremental directory syncs. A manifest of (size, mtime, hash) is built for
+the source and for the destination, and only the files that differ are copied
+(with the copy engine in copier.py). Files that aren't in the source can be
+deleted from the destination.
+
+By default files are compared by size and mtime (copies keep the mtime of the
+source, as shutil.copy2() does). With checksum=True they are compared by the
+hash of their contents instead. When a manifest path is given, the manifests
+are saved there (as zlib-compressed JSON) and a file's hash is only recomputed
+if its size or mtime changed, so a repeat sync is mostly stat-only.
+
+As in copy_tree(), symbolic links in the source are followed: a link to a
+file is synced as a copy of the file and a link to a directory as a directory
+with its contents (a link back to one of its own parent directories is
+skipped). Links in the destination are never followed: they are listed as
+links, a link where the source has a file or a directory is replaced by it
+(the link itself is removed, not what it points to), and deleting can't
+remove anything outside of the destination.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+import hashlib
+import json
+from multiprocessing.pool import ThreadPool
+import os
+import shutil
+import time
+import zlib
+
+from .copier import CopyStats, _copy_job
+
+
+MANIFEST_VERSION = 1
+LINK = 'link'  # The manifest entry of a link that isn't followed
+
+
+class SyncStats(CopyStats):
+    """The results of a sync_tree(). Extends CopyStats; `skipped` counts the
+    files that were unchanged and `deleted` the files and directories that
+    were removed from the destination."""
+
+    def __init__(self):
+        """Initializes new, empty SyncStats."""
+        super(SyncStats, self).__init__()
+        self.deleted = 0
+
+    def __str__(self):
+        """Returns a human readable summary."""
+        return super(SyncStats, self).__str__() + ', deleted {0}'.format(self.deleted)
+
+
+def mtime_ns(stat):
+    """Returns the mtime of a stat result in (integer) nanoseconds."""
+    if hasattr(stat, 'st_mtime_ns'):
+        return stat.st_mtime_ns
+    return int(stat.st_mtime * 1000000000)  # Python 2
+
+
+def file_hash(path, size=1048576):
+    """Returns the hex sha1 of the contents of the file at path."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as the_file:
+        for chunk in iter(lambda: the_file.read(size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(root, checksum=False, previous=None, followlinks=False):
+    """Returns the manifest of the directory root: a dict mapping each path
+    (relative to root, with '/' separators) to [size, mtime_ns, hash] for a
+    file or None for a directory. The hash is None unless checksum is True,
+    in which case it is reused from the previous manifest for any file whose
+    size and mtime haven't changed. If followlinks is True, links are treated
+    as what they point to, and the contents of linked directories are
+    included (except for links to a parent); otherwise every link is LINK."""
+    previous = previous or {}
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=followlinks):
+        relative = os.path.relpath(dirpath, root)
+        prefix = '' if relative == '.' else relative.replace(os.sep, '/') + '/'
+        if followlinks:
+            dirnames[:] = [name for name in dirnames if not _is_loop(dirpath, name)]
+        else:
+            for name in [name for name in dirnames + filenames if os.path.islink(os.path.join(dirpath, name))]:
+                manifest[prefix + name] = LINK
+            dirnames[:] = [name for name in dirnames if manifest.get(prefix + name) != LINK]
+            filenames = [name for name in filenames if manifest.get(prefix + name) != LINK]
+        for name in dirnames:
+            manifest[prefix + name] = None
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(path) if followlinks else os.lstat(path)
+            except OSError as error:
+                if error.errno == errno.ENOENT:  # Removed (or a broken link)
+                    continue
+                raise
+            entry = [stat.st_size, mtime_ns(stat), None]
+            if checksum:
+                known = previous.get(prefix + name)
+                if known and known != LINK and known[:2] == entry[:2] and known[2]:
+                    entry[2] = known[2]
+                else:
+                    entry[2] = file_hash(path)
+            manifest[prefix + name] = entry
+    return manifest
+
+
+def _is_loop(dirpath, name):
+    """Returns True if name in dirpath is a link to dirpath or to one of its
+    parents (and so would be walked forever)."""
+    path = os.path.join(dirpath, name)
+    if not os.path.islink(path):
+        return False
+    target, current = os.path.realpath(path), os.path.realpath(dirpath)
+    return current == target or current.startswith(target.rstrip(os.sep) + os.sep)
+
+
+def load_manifests(path):
+    """Returns the (source, destination) manifests saved at path, or a pair
+    of empty manifests if there aren't any (or they can't be read)."""
+    try:
+        with open(path, 'rb') as the_file:
+            saved = json.loads(zlib.decompress(the_file.read()).decode('utf-8'))
+        if saved.get('version') == MANIFEST_VERSION:
+            return saved['source'], saved['destination']
+    except (IOError, OSError, ValueError, KeyError, zlib.error):
+        pass
+    return {}, {}
+
+
+def save_manifests(path, source, destination):
+    """Saves the source and destination manifests to path."""
+    data = json.dumps({'version' : MANIFEST_VERSION, 'source' : source, 'destination' : destination},
+                      separators=(',', ':'))
+    with open(path, 'wb') as the_file:
+        the_file.write(zlib.compress(data.encode('utf-8')))
+
+
+def changed(source_entry, destination_entry, checksum=False):
+    """Returns True if a source file's manifest entry differs from the
+    destination's (i.e. the file needs to be copied)."""
+    if destination_entry in (None, LINK) or source_entry[0] != destination_entry[0]:
+        return True
+    if checksum:
+        return source_entry[2] != destination_entry[2]
+    return source_entry[1] != destination_entry[1]
+
+
+def sync_tree(source, destination, delete=False, checksum=False, manifest=None, workers=4):
+    """Syncs the contents of the directory source into destination (which is
+    created if needed), copying only the files that changed.
+
+    :param delete: If True, files and directories that aren't in the source
+        are removed from the destination.
+    :param checksum: If True, files are compared by their contents' hash
+        rather than their size and mtime.
+    :param manifest: A path to save the manifests at between syncs.
+    :param workers: The number of threads copying files.
+
+    Returns SyncStats.
+    """
+    stats = SyncStats()
+    start = time.time()
+    previous_source, previous_destination = load_manifests(manifest) if manifest else ({}, {})
+    source_manifest = build_manifest(source, checksum, previous_source, followlinks=True)
+    destination_manifest = build_manifest(destination, checksum, previous_destination) \
+        if os.path.isdir(destination) else {}
+
+    if not os.path.isdir(destination):
+        os.makedirs(destination)
+        stats.dirs += 1
+
+    # Directories first (sorted, so parents come before their children)
+    blocked = []  # Directories that couldn't be made, so nothing is copied into them
+    for relative in sorted(relative for relative, entry in source_manifest.items() if entry is None):
+        if relative not in destination_manifest or destination_manifest[relative] == LINK:
+            path = os.path.join(destination, relative)
+            try:
+                if destination_manifest.get(relative) == LINK:
+                    os.remove(path)  # Never copy into (what a link points to)
+                os.makedirs(path)
+                stats.dirs += 1
+            except OSError as error:
+                if error.errno != errno.EEXIST or os.path.islink(path):
+                    stats.errors.append((os.path.join(source, relative), error))
+                    blocked.append(relative + '/')
+
+    jobs = []
+    for relative, entry in source_manifest.items():
+        if entry is None or relative.startswith(tuple(blocked)):
+            continue
+        if changed(entry, destination_manifest.get(relative), checksum):
+            jobs.append((os.path.join(source, relative), os.path.join(destination, relative), 'overwrite', False))
+        else:
+            stats.skipped += 1
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        for path, size, method, error in pool.imap_unordered(_copy_job, jobs, 16):
+            relative = os.path.relpath(path, source).replace(os.sep, '/')
+            if error is not None:
+                stats.errors.append((path, error))
+                destination_manifest.pop(relative, None)
+            else:
+                stats.files += 1
+                stats.bytes += size
+                stats.methods[method] = stats.methods.get(method, 0) + 1
+                destination_manifest[relative] = list(source_manifest[relative])  # Copies keep the mtime
+    finally:
+        pool.close()
+        pool.join()
+
+    for relative in source_manifest:
+        if source_manifest[relative] is None:
+            destination_manifest[relative] = None
+
+    if delete:
+        # Deepest first, so a directory is empty by the time it is removed
+        for relative in sorted((relative for relative in destination_manifest if relative not in source_manifest),
+                               reverse=True):
+            path = os.path.join(destination, relative)
+            try:
+                if destination_manifest[relative] is None and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+                stats.deleted += 1
+                del destination_manifest[relative]
+            except OSError as error:
+                if error.errno == errno.ENOENT:  # Already removed with its directory
+                    del destination_manifest[relative]
+                else:
+                    stats.errors.append((path, error))
+
+    if manifest:
+        try:
+            save_manifests(manifest, source_manifest, destination_manifest)
+        except (IOError, OSError) as error:
+            stats.errors.append((manifest, error))
+    stats.elapsed = time.time() - start
+    return stats
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             template.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.template
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Compiled templates. Instead of one str.replace() (one pass over the data and
+one new string) per placeholder, the template is split once, in a single
+regex scan, into its literal text and the placeholders between it. Rendering
+is then one join, linear in the size of the output.
+
+Placeholders are matched longest first, so one placeholder that contains
+another (e.g. '#DATA#' and '#DATA#_DIR') is never split. Values are inserted
+as-is; they aren't searched for placeholders themselves.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import re
+
+
+class CompiledTemplate(object):
+    """A template split into its literal text and placeholders.
+
+    :param data: The template (string).
+    :param placeholders: The placeholders (any iterable of strings, e.g. the
+        keys of the dict that will be passed to render()).
+
+    Usage::
+
+        >>> from ext_pylib.files import CompiledTemplate
+
+        >>> template = CompiledTemplate('ServerName #DOMAIN#', ['#DOMAIN#'])
+        >>> template.render({'#DOMAIN#' : 'example.com'})
+        'ServerName example.com'
+    """
+
+    def __init__(self, data, placeholders):
+        """Splits data on the placeholders."""
+        placeholders = sorted(set(placeholder for placeholder in placeholders if placeholder),
+                              key=len, reverse=True)
+        self.literals, self.slots = [], []
+        if not placeholders:
+            self.literals.append(data)
+            return
+        regex = re.compile('|'.join(re.escape(placeholder) for placeholder in placeholders))
+        position = 0
+        for match in regex.finditer(data):
+            self.literals.append(data[position:match.start()])
+            self.slots.append(match.group())
+            position = match.end()
+        self.literals.append(data[position:])
+
+    def render(self, values):
+        """Returns the template with each placeholder replaced by its value in
+        the dict values."""
+        literals = self.literals
+        pieces = [literals[0]]
+        for index, slot in enumerate(self.slots):
+            pieces.append(values[slot])
+            pieces.append(literals[index + 1])
+        return ''.join(pieces)
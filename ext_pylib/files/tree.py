@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             tree.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.tree
+~~~~~~~~~~~~~~~~~~~~
+
+Recursive chmod and chown of a directory tree. The tree is walked with
+os.fwalk() and every call is made relative to an open directory fd (so the
+kernel doesn't resolve the whole path each time and a directory that is
+renamed mid-walk can't redirect it). Entries that already have the right
+permissions or ownership are left alone.
+
+Symbolic links are never followed. chmod_tree() only changes regular files and
+directories, and it opens each one with O_NOFOLLOW and checks and changes it
+through the fd (fstat() and fchmod()), so an entry swapped for a link after it
+was listed is skipped rather than followed. An entry that can't be opened
+because its owner can't read it (e.g. mode 0o000) is changed by name relative
+to the directory fd instead (fchmodat()), without following a link where the
+platform allows it. chown_tree() changes links themselves (lchown).
+
+Where os.fwalk() isn't available (Python 2), the tree is walked with os.walk()
+and paths are used instead, so only the last component of each path is
+protected from being swapped for a link.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+import os
+import stat as stat_module
+import time
+
+
+class TreeStats(object):  # pylint: disable=too-few-public-methods
+    """The results of a chmod_tree() or chown_tree(). `errors` is a list of
+    (path, error) tuples."""
+
+    def __init__(self):
+        """Initializes new, empty TreeStats."""
+        self.changed = self.unchanged = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def __str__(self):
+        """Returns a human readable summary."""
+        return 'Changed {0}, unchanged {1}, {2} errors in {3:.2f}s'.format(
+            self.changed, self.unchanged, len(self.errors), self.elapsed)
+
+
+# Opening a FIFO (or a terminal) mustn't block (or take the terminal)
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0) | getattr(os, 'O_NOCTTY', 0)
+
+
+def _use_fwalk():
+    """Returns True if the tree can be walked with directory fds."""
+    return hasattr(os, 'fwalk') and all(function in os.supports_dir_fd for function in (os.open, os.chmod, os.chown))
+
+
+def _entries(top, stats):
+    """Yields (path, name, dir_fd, stat) for top and everything under it.
+    dir_fd is None when name should be used as a plain path. Errors are
+    added to stats."""
+    def onerror(error):
+        """Records a directory that couldn't be walked."""
+        stats.errors.append((error.filename, error))
+
+    try:
+        yield top, top, None, os.stat(top)
+    except OSError as error:
+        stats.errors.append((top, error))
+        return
+
+    if _use_fwalk():
+        for root, dirs, files, root_fd in os.fwalk(top, onerror=onerror):
+            for name in dirs + files:
+                try:
+                    yield os.path.join(root, name), name, root_fd, os.stat(name, dir_fd=root_fd, follow_symlinks=False)
+                except OSError as error:
+                    stats.errors.append((os.path.join(root, name), error))
+        return
+
+    for root, dirs, files in os.walk(top, onerror=onerror):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            try:
+                yield path, path, None, os.lstat(path)
+            except OSError as error:
+                stats.errors.append((path, error))
+
+
+def chmod_tree(top, file_perms=None, dir_perms=None):
+    """Sets the permissions of every file (to file_perms) and directory
+    (to dir_perms), including top, in the tree. Either may be None to leave
+    them alone. Returns TreeStats."""
+    stats = TreeStats()
+    start = time.time()
+    for path, name, dir_fd, stat in _entries(top, stats):
+        if not (stat_module.S_ISREG(stat.st_mode) or stat_module.S_ISDIR(stat.st_mode)):
+            continue  # Links (and devices, FIFOs, etc.) are left alone
+        perms = dir_perms if stat_module.S_ISDIR(stat.st_mode) else file_perms
+        if perms is None or stat.st_mode & 511 == perms:
+            stats.unchanged += 1
+            continue
+        try:
+            try:
+                _fchmod(name, dir_fd, name == top and dir_fd is None, perms, stats)
+            except OSError as error:
+                if error.errno != errno.EACCES:
+                    raise
+                _chmod_at(name, dir_fd, perms)  # Can't be opened to read
+                stats.changed += 1
+        except OSError as error:
+            if error.errno not in (errno.ELOOP, errno.EOPNOTSUPP):  # Swapped for a link, so left alone
+                stats.errors.append((path, error))
+    stats.elapsed = time.time() - start
+    return stats
+
+
+def _fchmod(name, dir_fd, follow, perms, stats):
+    """Opens name (relative to dir_fd, unless it is None) without following a
+    link (unless follow is set) and, if it is still a regular file or
+    directory without perms, sets perms through the fd. Counts it in stats."""
+    flags = _OPEN_FLAGS if follow else _OPEN_FLAGS | os.O_NOFOLLOW
+    fd = os.open(name, flags) if dir_fd is None else os.open(name, flags, dir_fd=dir_fd)
+    try:
+        mode = os.fstat(fd).st_mode
+        if not (stat_module.S_ISREG(mode) or stat_module.S_ISDIR(mode)):
+            return
+        if mode & 511 == perms:
+            stats.unchanged += 1
+        else:
+            os.fchmod(fd, perms)
+            stats.changed += 1
+    finally:
+        os.close(fd)
+
+
+def _chmod_at(name, dir_fd, perms):
+    """Sets perms on name (relative to dir_fd, unless it is None) without
+    opening it, and without following a link if the platform can do that."""
+    if dir_fd is None:
+        os.chmod(name, perms)
+        return
+    try:
+        os.chmod(name, perms, dir_fd=dir_fd, follow_symlinks=False)
+    except NotImplementedError:  # It was a file or directory when it was listed
+        os.chmod(name, perms, dir_fd=dir_fd)
+
+
+def chown_tree(top, uid=-1, gid=-1):
+    """Sets the owner (to uid) and group (to gid) of everything, including
+    top, in the tree. Either may be -1 to leave it alone. Links themselves
+    are changed rather than what they point to. Returns TreeStats."""
+    stats = TreeStats()
+    start = time.time()
+    for path, name, dir_fd, stat in _entries(top, stats):
+        if uid in (-1, stat.st_uid) and gid in (-1, stat.st_gid):
+            stats.unchanged += 1
+            continue
+        try:
+            if dir_fd is None:
+                (os.chown if name == top else os.lchown)(name, uid, gid)
+            else:
+                os.chown(name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+            stats.changed += 1
+        except OSError as error:
+            stats.errors.append((path, error))
+    stats.elapsed = time.time() - start
+    return stats
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             verify.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.verify
+~~~~~~~~~~~~~~~~~~~~~~
+
+A verification engine for nodes. Unlike Node.verify(), each node is stat'ed
+exactly once and its permissions, owner, and group are all checked against
+that one snapshot. Only nodes that are repaired are stat'ed again. Nothing is
+printed; the outcome is returned as a VerifyResult.
+
+verify_many() and repair_many() run the engine over a collection of nodes on a
+bounded thread pool, which helps when each stat and chown is a network round
+trip (e.g. NFS-backed web roots).
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import errno
+from multiprocessing.pool import ThreadPool
+import os
+
+from ..user import getpwnam, getpwuid, getgrnam, getgrgid
+
+
+class VerifyResult(object):
+    """The result of verifying a single node.
+
+    :param node: The node that was verified.
+
+    Each check is stored in `checks` as name: (expected, actual). A check is
+    only made if the node has that attribute set (perms, owner, or group).
+    `repaired` lists the checks that were repaired (including 'exists' if the
+    node had to be created) and `errors` holds any exception raised while
+    stat'ing or repairing the node.
+
+    Usage::
+
+        >>> from ext_pylib.files import File
+
+        >>> result = File({'path' : '/the/path/file', 'perms' : 0o600}).check()
+        >>> result.ok
+        False
+        >>> result.failures
+        ['perms']
+        >>> result.checks['perms']
+        (384, 420)
+    """
+
+    def __init__(self, node):
+        """Initializes a new VerifyResult for node."""
+        self.node = node
+        self.exists = None
+        self.checks = {}
+        self.repaired = []
+        self.errors = []
+
+    def __repr__(self):
+        """Returns a python string representation of the result."""
+        return '<VerifyResult {0} {1}>'.format(self.path, 'OK' if self.ok else self.failures)
+
+    def __bool__(self):
+        """A result is truthy if verification passed."""
+        return self.ok
+
+    __nonzero__ = __bool__  # Python 2
+
+    @property
+    def path(self):
+        """Returns the path of the verified node."""
+        return self.node.path
+
+    @property
+    def failures(self):
+        """Returns a list of the names of the checks that failed."""
+        failures = []
+        if not self.exists:
+            failures.append('exists')
+        for name in ('perms', 'owner', 'group'):
+            if name in self.checks and self.checks[name][0] != self.checks[name][1]:
+                failures.append(name)
+        if self.errors:
+            failures.append('errors')
+        return failures
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Returns True if the node exists and every check passed."""
+        return not self.failures
+
+
+class VerifyReport(object):
+    """The aggregated results of verifying many nodes.
+    Results are kept in the same order as the nodes that were passed in.
+
+    :param results: A list of VerifyResults.
+
+    Usage::
+
+        >>> from ext_pylib.files import verify_many
+
+        >>> report = verify_many([a_file, a_dir], workers=8)
+        >>> report.ok
+        False
+        >>> report.failures
+        [<VerifyResult /the/path/file ['perms']>]
+    """
+
+    def __init__(self, results):
+        """Initializes a new VerifyReport."""
+        self.results = results
+
+    def __repr__(self):
+        """Returns a python string representation of the report."""
+        return '<VerifyReport {0} nodes, {1} failed>'.format(len(self), len(self.failures))
+
+    def __len__(self):
+        """Returns the number of nodes verified."""
+        return len(self.results)
+
+    def __iter__(self):
+        """Iterates over the results in order."""
+        return iter(self.results)
+
+    def __getitem__(self, index):
+        """Returns the result at index."""
+        return self.results[index]
+
+    def __bool__(self):
+        """A report is truthy if every node passed."""
+        return self.ok
+
+    __nonzero__ = __bool__  # Python 2
+
+    @property
+    def failures(self):
+        """Returns a list of the results that failed."""
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def repaired(self):
+        """Returns a list of the results that had something repaired."""
+        return [result for result in self.results if result.repaired]
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Returns True if every node passed."""
+        return all(result.ok for result in self.results)
+
+
+def snapshot(path, fd=None):
+    """Returns an os.stat() result for path (or os.fstat() of fd, if it is
+    given), or None if it doesn't exist."""
+    try:
+        if fd is not None:
+            return os.fstat(fd)
+        return os.stat(path)
+    except OSError as error:
+        if error.errno in (errno.ENOENT, errno.ENOTDIR):
+            return None
+        raise
+
+
+def _check(node, stat, result):
+    """Fills in result.checks by comparing node's atts to a stat snapshot.
+    Names are only looked up when a check fails, for reporting."""
+    result.checks = {}
+    if node.perms:
+        result.checks['perms'] = (node.perms, stat.st_mode & 511)
+    if node.owner:
+        uid = getpwnam(node.owner).pw_uid
+        actual = node.owner if uid == stat.st_uid else _username(stat.st_uid)
+        result.checks['owner'] = (node.owner, actual)
+    if node.group:
+        gid = getgrnam(node.group).gr_gid
+        actual = node.group if gid == stat.st_gid else _groupname(stat.st_gid)
+        result.checks['group'] = (node.group, actual)
+
+
+def _username(uid):
+    """Returns the name of uid, or the uid as a string if it has no name."""
+    try:
+        return getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+def _groupname(gid):
+    """Returns the name of gid, or the gid as a string if it has no name."""
+    try:
+        return getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def _repair(node, result):
+    """Repairs the failed perms, owner, and group checks in result."""
+    failures = result.failures
+    fd = getattr(node, 'fd', None)
+    if 'perms' in failures:
+        if fd is not None:
+            os.fchmod(fd, node.perms)
+        else:
+            os.chmod(node.path, node.perms)
+        result.repaired.append('perms')
+    if 'owner' in failures or 'group' in failures:
+        uid = getpwnam(node.owner).pw_uid if 'owner' in failures else -1
+        gid = getgrnam(node.group).gr_gid if 'group' in failures else -1
+        if fd is not None:
+            os.fchown(fd, uid, gid)
+        else:
+            os.chown(node.path, uid, gid)
+        result.repaired.extend([name for name in ('owner', 'group') if name in failures])
+
+
+def verify_node(node, repair=False):
+    """Verifies the existence, permissions, ownership, and group of a node
+    using a single stat snapshot and returns a VerifyResult. If repair is set,
+    a missing node is created and failed checks are fixed; the node is then
+    stat'ed one more time to confirm the repair. If the node has an open fd
+    (see File.opened()), it is fstat'ed instead."""
+    result = VerifyResult(node)
+    if not node.path:  # Stubs always verify
+        result.exists = True
+        return result
+
+    try:
+        stat = snapshot(node.path, getattr(node, 'fd', None))
+        if stat is None:
+            result.exists = False
+            if not repair:
+                return result
+            if not node.create():
+                return result
+            result.repaired.append('exists')
+            stat = snapshot(node.path)
+            if stat is None:
+                return result
+        result.exists = True
+
+        _check(node, stat, result)
+        if repair and result.failures:
+            _repair(node, result)
+            stat = snapshot(node.path, getattr(node, 'fd', None))
+            if stat is None:
+                result.exists = False
+                return result
+            _check(node, stat, result)
+    except (OSError, IOError, KeyError) as error:
+        result.errors.append(error)
+    return result
+
+
+def _verify(node):
+    """Pool worker for verify_many()."""
+    return verify_node(node)
+
+
+def _repair_node(node):
+    """Pool worker for repair_many()."""
+    return verify_node(node, True)
+
+
+def verify_many(nodes, workers=4, repair=False):
+    """Verifies an iterable of nodes on a pool of (at most) workers threads.
+    Returns a VerifyReport with one result per node, in order."""
+    nodes = list(nodes)
+    func = _repair_node if repair else _verify
+    if workers <= 1 or len(nodes) <= 1:
+        return VerifyReport([func(node) for node in nodes])
+    pool = ThreadPool(min(workers, len(nodes)))
+    try:
+        return VerifyReport(pool.map(func, nodes))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def repair_many(nodes, workers=4):
+    """Runs verify_many() with the repair flag set."""
+    return verify_many(nodes, workers, True)
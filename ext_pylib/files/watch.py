@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             watch.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=line-too-long
+
+"""
+ext_pylib.files.watch
+~~~~~~~~~~~~~~~~~~~~~
+
+Change notifications for files and directories, instead of polling them by
+rereading them. A callback is registered for a path; a path ending in '/' is
+a directory, and its callbacks are called for every entry in it that changes.
+
+On Linux, an InotifyWatcher uses inotify (through ctypes). It watches the
+parent directory of each file, rather than the file itself, so that a file
+replaced by a rename (e.g. by an atomic write, see atomic.py) is still seen,
+and so that thousands of files in a few directories only need a few watches.
+A file counts as changed when it is closed after writing, created, removed,
+or renamed to or from its path.
+
+Elsewhere, a PollingWatcher stat()s the watched paths (and the entries of the
+watched directories) every interval instead, and compares their (mtime, size,
+inode) as the content cache does (see cache.py).
+
+The watcher returned by get_watcher() is shared by the whole process and
+calls the callbacks from a daemon thread. See Node.watch() for watching a
+File or Dir.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+
+from .cache import stat_key
+
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+
+_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+_EVENT = struct.Struct(str('iIII'))  # wd, mask, cookie, len (then the name)
+
+
+def _normalize(path):
+    """Returns the absolute path, still ending in '/' if it is a directory."""
+    directory = path.endswith('/')
+    path = os.path.abspath(path)
+    return path + '/' if directory and not path.endswith('/') else path
+
+
+def _directory(path):
+    """Returns the directory watched for path."""
+    if path.endswith('/'):
+        return path.rstrip('/') or '/'
+    return os.path.dirname(path) or '.'
+
+
+class Watcher(object):
+    """The callbacks registered for paths, and the thread that calls them.
+    Subclasses watch the paths and implement poll().
+
+    Usage::
+
+        >>> from ext_pylib.files import get_watcher
+
+        >>> def reload(path):
+        ...     print(path + ' changed.')
+
+        >>> watcher = get_watcher()
+        >>> watcher.watch('/etc/nginx/nginx.conf', reload)
+    """
+
+    interval = 1.0  # The longest poll() waits in the thread
+
+    def __init__(self):
+        """Initializes a new Watcher, watching nothing."""
+        self._lock = threading.RLock()
+        self._callbacks = {}  # path: [callbacks]
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        """Starts the watcher."""
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stops the watcher."""
+        self.stop()
+
+    def watch(self, path, callback):
+        """Calls callback(path) when the file at path changes. If path ends in
+        '/', calls callback(entry path) when any entry in the directory
+        changes."""
+        path = _normalize(path)
+        with self._lock:
+            if path not in self._callbacks:
+                self._add(path)
+                self._callbacks[path] = []
+            self._callbacks[path].append(callback)
+        return path
+
+    def unwatch(self, path, callback=None):
+        """Stops calling callback (or every callback) for path."""
+        path = _normalize(path)
+        with self._lock:
+            callbacks = self._callbacks.get(path, [])
+            if callback is not None and callback in callbacks:
+                callbacks.remove(callback)
+            if callback is None or not callbacks:
+                if self._callbacks.pop(path, None) is not None:
+                    self._remove(path)
+
+    @property
+    def paths(self):
+        """Returns a sorted list of the watched paths."""
+        with self._lock:
+            return sorted(self._callbacks)
+
+    def start(self):
+        """Starts a daemon thread that polls and calls the callbacks."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='ext_pylib-watcher')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stops the thread (if it was started)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join()
+
+    def _run(self):
+        """The thread: polls until stopped."""
+        while not self._stopping.is_set():
+            self.poll(self.interval)
+
+    def poll(self, timeout=0):
+        """Waits up to timeout seconds for changes, and calls the callbacks
+        for them. Returns the number of changed paths."""
+        raise NotImplementedError
+
+    def close(self):
+        """Stops the watcher and stops watching everything."""
+        self.stop()
+        for path in self.paths:
+            self.unwatch(path)
+
+    def _add(self, path):
+        """Starts watching path (a file, or a directory if it ends in '/')."""
+        raise NotImplementedError
+
+    def _remove(self, path):
+        """Stops watching path."""
+        raise NotImplementedError
+
+    def _dispatch(self, changed):
+        """Calls the callbacks of each of the changed paths (and of the
+        watched directories they are in). A changed path ending in '/' (after
+        lost events) only calls the directory's callbacks. Returns the number
+        of paths."""
+        for path in sorted(changed):
+            with self._lock:
+                callbacks = list(self._callbacks.get(path, []))
+                if not path.endswith('/'):
+                    callbacks += self._callbacks.get(os.path.dirname(path).rstrip('/') + '/', [])
+            for callback in callbacks:
+                try:
+                    callback(path)
+                except Exception as error:  # pylint: disable=broad-except
+                    print('[ERROR] ' + path + ': ' + str(error))
+        return len(changed)
+
+
+class InotifyWatcher(Watcher):
+    """A Watcher that uses Linux's inotify, with one watch per directory.
+    Raises OSError if inotify isn't available."""
+
+    def __init__(self):
+        """Initializes a new InotifyWatcher, with its own inotify instance."""
+        super(InotifyWatcher, self).__init__()
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._wds = {}  # wd: directory
+        self._directories = {}  # directory: [wd, number of watched paths]
+
+    def close(self):
+        """Stops the watcher and closes the inotify instance."""
+        super(InotifyWatcher, self).close()
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add(self, path):
+        """Adds a watch to path's directory (unless it already has one)."""
+        directory = _directory(path)
+        if directory in self._directories:
+            self._directories[directory][1] += 1
+            return
+        wd = self._libc.inotify_add_watch(self._fd, directory.encode(sys.getfilesystemencoding()), _MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), directory)
+        self._wds[wd] = directory
+        self._directories[directory] = [wd, 1]
+
+    def _remove(self, path):
+        """Removes the watch from path's directory, once nothing in it is watched."""
+        directory = _directory(path)
+        entry = self._directories.get(directory)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._directories[directory]
+            self._wds.pop(entry[0], None)
+            self._libc.inotify_rm_watch(self._fd, entry[0])
+
+    def poll(self, timeout=0):
+        """Waits up to timeout seconds for inotify events, and calls the
+        callbacks for the paths they name. Returns the number of changed paths."""
+        try:
+            readable = select.select([self._fd], [], [], timeout)[0]
+        except (OSError, select.error) as error:
+            if error.args[0] != errno.EINTR:
+                raise
+            return 0
+        if not readable:
+            return 0
+        buf = os.read(self._fd, 65536)
+        changed, position = set(), 0
+        with self._lock:
+            while position < len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, position)
+                name = buf[position + _EVENT.size:position + _EVENT.size + length].rstrip(b'\0')
+                position += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:  # Events were lost, so everything may have changed
+                    changed.update(self._callbacks)
+                elif mask & IN_IGNORED:  # The directory was removed
+                    directory = self._wds.pop(wd, None)
+                    if self._directories.get(directory, [None])[0] == wd:
+                        del self._directories[directory]
+                elif wd in self._wds and name:
+                    changed.add(os.path.join(self._wds[wd], name.decode(sys.getfilesystemencoding())))
+        return self._dispatch(changed)
+
+
+class PollingWatcher(Watcher):
+    """A Watcher that stat()s the watched paths (and the entries of the
+    watched directories) on every poll. Works everywhere, but every poll
+    costs a stat() per path.
+
+    :param interval: The seconds between polls in the thread.
+    """
+
+    def __init__(self, interval=1.0):
+        """Initializes a new PollingWatcher."""
+        super(PollingWatcher, self).__init__()
+        self.interval = interval
+        self._snapshots = {}  # path: {path: key}
+
+    @staticmethod
+    def _snapshot(path):
+        """Returns a dict of path (or of each entry in the directory path) to
+        its (mtime, size, inode)."""
+        if not path.endswith('/'):
+            try:
+                return {path : stat_key(os.stat(path))}
+            except OSError:
+                return {}
+        snapshot = {}
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return snapshot
+        for name in names:
+            try:
+                snapshot[path + name] = stat_key(os.stat(path + name))
+            except OSError:
+                pass
+        return snapshot
+
+    def _add(self, path):
+        """Takes the first snapshot of path."""
+        self._snapshots[path] = self._snapshot(path)
+
+    def _remove(self, path):
+        """Drops the snapshot of path."""
+        self._snapshots.pop(path, None)
+
+    def poll(self, timeout=0):
+        """Compares every watched path with its last snapshot, and calls the
+        callbacks for the paths that changed. If nothing changed, waits up to
+        timeout seconds and compares again. Returns the number of changed
+        paths."""
+        changed = self._compare()
+        if not changed and timeout and not self._stopping.wait(timeout):
+            changed = self._compare()
+        return self._dispatch(changed)
+
+    def _compare(self):
+        """Returns the set of paths that changed since their last snapshots."""
+        changed = set()
+        with self._lock:
+            for path, old in list(self._snapshots.items()):
+                new = self._snapshot(path)
+                if new != old:
+                    changed.update(entry for entry in set(old) | set(new) if old.get(entry) != new.get(entry))
+                    self._snapshots[path] = new
+        return changed
+
+
+def _libc():
+    """Returns libc (with the inotify functions). Raises OSError if there
+    isn't an inotify."""
+    if not sys.platform.startswith('linux'):
+        raise OSError(errno.ENOSYS, 'inotify is only available on Linux.')
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError(errno.ENOSYS, 'This libc has no inotify.')
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def new_watcher(interval=1.0):
+    """Returns a new InotifyWatcher, if inotify is available, or a new
+    PollingWatcher that polls every interval seconds."""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError):
+        return PollingWatcher(interval)
+
+
+_WATCHER = []
+_WATCHER_LOCK = threading.Lock()
+
+
+def get_watcher():
+    """Returns the watcher shared by the whole process, started."""
+    with _WATCHER_LOCK:
+        if not _WATCHER:
+            _WATCHER.append(new_watcher())
+            _WATCHER[0].start()
+        return _WATCHER[0]
@@ -10,4 +10,5 @@ Extra python libraries for scaffolding server scripts.
 
 from __future__ import absolute_import
 
+from .cache import NameCache, getpwnam, getpwuid, getgrnam, getgrgid, invalidate_cache, cache_stats
 from .user import get_current_username, get_current_groupname
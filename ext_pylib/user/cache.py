@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             cache.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+
+"""
+ext_pylib.user.cache
+~~~~~~~~~~~~~~~~~~~~
+
+A thread-safe cache in front of the pwd and grp lookup functions. When NSS is
+backed by LDAP or sssd, every lookup can cost milliseconds; the cache keeps
+each entry for a time-to-live (ttl) and can be invalidated explicitly.
+
+Failed lookups (KeyError) are never cached.
+"""
+
+import grp
+import pwd
+import threading
+import time
+
+
+class NameCache(object):
+    """A cache of user and group database entries.
+
+    :param ttl: Seconds an entry stays valid. None means entries never expire.
+
+    Usage::
+
+        >>> from ext_pylib.user import NameCache
+
+        >>> cache = NameCache(ttl=60)
+        >>> cache.getpwnam('root').pw_uid
+        0
+        >>> cache.getpwnam('root').pw_uid
+        0
+        >>> cache.stats()
+        {'hits': 1, 'misses': 1, 'entries': 1}
+    """
+
+    def __init__(self, ttl=300):
+        """Initializes a new, empty NameCache."""
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables = {'pwnam' : {}, 'pwuid' : {}, 'grnam' : {}, 'grgid' : {}}
+        self.hits = self.misses = 0
+
+    def _lookup(self, table, key, lookup_func):
+        """Returns the cached entry for key in table, calling lookup_func(key)
+        on a miss. The lookup itself is made outside of the lock."""
+        now = time.time()
+        with self._lock:
+            entry = self._tables[table].get(key)
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = lookup_func(key)
+        expires = None if self.ttl is None else now + self.ttl
+        with self._lock:
+            self._tables[table][key] = (expires, value)
+        return value
+
+    def getpwnam(self, name):
+        """Cached pwd.getpwnam()."""
+        return self._lookup('pwnam', name, pwd.getpwnam)
+
+    def getpwuid(self, uid):
+        """Cached pwd.getpwuid()."""
+        return self._lookup('pwuid', uid, pwd.getpwuid)
+
+    def getgrnam(self, name):
+        """Cached grp.getgrnam()."""
+        return self._lookup('grnam', name, grp.getgrnam)
+
+    def getgrgid(self, gid):
+        """Cached grp.getgrgid()."""
+        return self._lookup('grgid', gid, grp.getgrgid)
+
+    def invalidate(self):
+        """Empties the cache. Hit and miss counters are kept."""
+        with self._lock:
+            for table in self._tables.values():
+                table.clear()
+
+    def reset_stats(self):
+        """Resets the hit and miss counters."""
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Returns a dict of the number of hits, misses, and cached entries."""
+        with self._lock:
+            return {'hits' : self.hits, 'misses' : self.misses,
+                    'entries' : sum(len(table) for table in self._tables.values())}
+
+
+# The shared, process-wide cache used by ext_pylib.
+CACHE = NameCache()
+
+def getpwnam(name):
+    """Returns the pwd entry for the user name (shared cache)."""
+    return CACHE.getpwnam(name)
+
+def getpwuid(uid):
+    """Returns the pwd entry for the uid (shared cache)."""
+    return CACHE.getpwuid(uid)
+
+def getgrnam(name):
+    """Returns the grp entry for the group name (shared cache)."""
+    return CACHE.getgrnam(name)
+
+def getgrgid(gid):
+    """Returns the grp entry for the gid (shared cache)."""
+    return CACHE.getgrgid(gid)
+
+def invalidate_cache():
+    """Empties the shared cache (e.g. after adding or removing users)."""
+    CACHE.invalidate()
+
+def cache_stats():
+    """Returns the shared cache's hit, miss, and entry counts as a dict."""
+    return CACHE.stats()
@@ -14,14 +14,16 @@ ext_pylib.user.user
 Functions for managing users.
 """
 
-import grp
+from __future__ import absolute_import
+
 import os
-import pwd
+
+from .cache import getpwuid, getgrgid
 
 def get_current_username():
     """Returns the current username as a string."""
-    return pwd.getpwuid(os.getuid()).pw_name
+    return getpwuid(os.getuid()).pw_name
 
 def get_current_groupname():
     """Returns the current groupname as a string."""
-    return grp.getgrgid(os.getgid()).gr_name
+    return getgrgid(os.getgid()).gr_name
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_atomic.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's atomic writes.
+"""
+
+import os
+
+from mock import patch
+import pytest
+
+from ext_pylib.files import AtomicFile, File, FsyncBatch, atomic_write
+
+
+def test_atomic_write_new_file(tmpdir):
+    """Test atomically writing a new file."""
+    path = str(tmpdir.join('file'))
+    assert atomic_write(path, 'The data...', perms=0o640)
+    assert open(path).read() == 'The data...'
+    assert os.stat(path).st_mode & 511 == 0o640
+    assert os.listdir(str(tmpdir)) == ['file']
+
+def test_atomic_write_replaces_file(tmpdir):
+    """Test that atomic_write replaces the file and keeps its permissions."""
+    path = tmpdir.join('file')
+    path.write('Old data...')
+    path.chmod(0o604)
+    inode = os.stat(str(path)).st_ino
+    atomic_write(str(path), 'New data...')
+    assert path.read() == 'New data...'
+    assert os.stat(str(path)).st_mode & 511 == 0o604
+    assert os.stat(str(path)).st_ino != inode
+
+def test_atomic_write_failure_leaves_file(tmpdir):
+    """Test that a failed atomic_write leaves the old file (and no temp file)."""
+    path = tmpdir.join('file')
+    path.write('Old data...')
+    with patch('os.rename', side_effect=OSError('Simulated failure')):
+        with pytest.raises(OSError):
+            atomic_write(str(path), 'New data...')
+    assert path.read() == 'Old data...'
+    assert os.listdir(str(tmpdir)) == ['file']
+
+def test_atomic_file(tmpdir):
+    """Test writing an AtomicFile in pieces, and discarding one."""
+    path = tmpdir.join('file')
+    path.write('Old data...')
+    with AtomicFile(str(path)) as output:
+        output.write('New ')
+        output.write('data...')
+        assert path.read() == 'Old data...'
+    assert path.read() == 'New data...'
+    with AtomicFile(str(path)) as output:
+        output.write('Discarded data...')
+        output.discard()
+    assert path.read() == 'New data...'
+    assert os.listdir(str(tmpdir)) == ['file']
+
+def test_atomic_file_mode_set_before_write(tmpdir):
+    """Test that the temporary file has its final mode before it is written,
+    and that a new file gets the default mode."""
+    path = tmpdir.join('secret')
+    path.write('DB_PASSWORD=old')
+    path.chmod(0o600)
+    with AtomicFile(str(path)) as output:
+        assert os.fstat(output.handle.fileno()).st_mode & 0o7777 == 0o600
+        output.write('DB_PASSWORD=new')
+    assert os.stat(str(path)).st_mode & 0o7777 == 0o600
+    with AtomicFile(str(path), perms=0o640) as output:
+        assert os.fstat(output.handle.fileno()).st_mode & 0o7777 == 0o640
+    umask = os.umask(0o027)
+    try:
+        atomic_write(str(tmpdir.join('new')), 'The data...')
+    finally:
+        os.umask(umask)
+    assert os.stat(str(tmpdir.join('new'))).st_mode & 0o7777 == 0o640
+
+def test_fsync_batch(tmpdir):
+    """Test that a FsyncBatch fsyncs each directory once."""
+    first, second = tmpdir.mkdir('first'), tmpdir.mkdir('second')
+    with patch('ext_pylib.files.atomic.fsync_dir') as mock_fsync_dir:
+        with FsyncBatch() as batch:
+            for directory in [first, second]:
+                for name in ['one', 'two', 'three']:
+                    atomic_write(str(directory.join(name)), name, batch=batch)
+            assert not mock_fsync_dir.called
+        assert sorted(call[0][0] for call in mock_fsync_dir.call_args_list) == [str(first), str(second)]
+
+def test_file_atomic_overwrite(tmpdir):
+    """Test overwriting a File in atomic mode."""
+    path = tmpdir.join('file')
+    path.write('Old data...')
+    inode = os.stat(str(path)).st_ino
+    the_file = File({'path' : str(path), 'atomic' : True})
+    assert the_file.overwrite('New data...')
+    assert path.read() == 'New data...'
+    assert os.stat(str(path)).st_ino != inode
+    assert the_file.append(' More data...')  # Appends aren't atomic
+    assert path.read() == 'New data... More data...'
+    assert the_file.atomic_write('Atomic data...', batch=FsyncBatch())
+    assert path.read() == 'Atomic data...'
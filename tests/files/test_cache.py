@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_cache.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's content cache.
+"""
+
+import os
+
+from mock import patch
+
+from ext_pylib.files import ContentCache, atomic_write
+
+
+def test_content_cache_read(tmpdir):
+    """Test that the cache only reads a file again when it changes."""
+    path = tmpdir.join('file')
+    path.write('The data...')
+    cache = ContentCache()
+    first = cache.read(str(path))
+    assert first == 'The data...'
+    assert cache.read(str(path)) is first
+    assert (cache.hits, cache.misses, len(cache), cache.bytes) == (1, 1, 1, 11)
+    path.write('New data, and more of it...')
+    assert cache.read(str(path)) == 'New data, and more of it...'
+    assert (cache.misses, len(cache), cache.bytes) == (2, 1, 27)
+
+def test_content_cache_replaced_file(tmpdir):
+    """Test that the cache notices a file replaced with the same size and mtime."""
+    path = tmpdir.join('file')
+    path.write('Old data...')
+    cache = ContentCache()
+    assert cache.read(str(path)) == 'Old data...'
+    mtime = os.stat(str(path)).st_mtime
+    atomic_write(str(path), 'New data...')  # A new inode
+    os.utime(str(path), (mtime, mtime))
+    assert cache.read(str(path)) == 'New data...'
+
+def test_content_cache_missing_file(tmpdir):
+    """Test that a missing (or removed) file is None and dropped from the cache."""
+    path = tmpdir.join('file')
+    cache = ContentCache()
+    assert cache.read(str(path)) is None
+    path.write('The data...')
+    assert cache.read(str(path)) == 'The data...'
+    path.remove()
+    assert cache.read(str(path)) is None
+    assert (len(cache), cache.bytes) == (0, 0)
+
+def test_content_cache_evicts_least_recently_used(tmpdir):
+    """Test that the cache stays within max_bytes."""
+    one, two, three, big = [tmpdir.join(name) for name in ['one', 'two', 'three', 'big']]
+    for path in [one, two, three]:
+        path.write('x' * 30)
+    big.write('x' * 100)
+    cache = ContentCache(max_bytes=70)
+    cache.read(str(one))
+    cache.read(str(two))
+    cache.read(str(one))  # Now two is the least recently used
+    cache.read(str(three))
+    assert (len(cache), cache.bytes) == (2, 60)
+    with patch('ext_pylib.files.cache.open', create=True, side_effect=open) as mock_open:
+        cache.read(str(one))
+        cache.read(str(three))
+        assert not mock_open.called
+        cache.read(str(two))
+        assert mock_open.called
+    assert cache.read(str(big)) == 'x' * 100  # Too big to cache
+    assert (len(cache), cache.bytes) == (2, 60)
+    cache.clear()
+    assert (len(cache), cache.bytes) == (0, 0)
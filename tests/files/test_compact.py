@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_compact.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's CompactNode class.
+"""
+
+from mock import patch
+import pytest
+
+from ext_pylib.files import CompactNode, Dir, File, verify_many
+
+
+def test_compact_node_initialization():
+    """Test initializing a CompactNode."""
+    node = CompactNode('/the//path/file', 0o640, 'nobody', 'nogroup')
+    assert node.path == '/the/path/file'
+    assert node.perms == 0o640
+    assert not node.is_dir
+    assert not hasattr(node, '__dict__')
+    assert repr(node) == "CompactNode('/the/path/file', 0o640, 'nobody', 'nogroup')"
+
+BAD_ARGS = [
+    (None, None),
+    ('', None),
+    ('/the/path/fi$le', None),
+    ('/the/path/file', 0o1000),
+]
+@pytest.mark.parametrize(("path", "perms"), BAD_ARGS)
+def test_compact_node_bad_args(path, perms):
+    """Test that CompactNode validates its path and perms."""
+    with pytest.raises(ValueError):
+        CompactNode(path, perms)
+
+@patch('ext_pylib.files.compact.getgrnam')
+@patch('ext_pylib.files.compact.getpwnam')
+def test_compact_node_lazy_validation(mock_getpwnam, mock_getgrnam):
+    """Test that the owner and group are only looked up by validate()."""
+    node = CompactNode('/the/path/file', 0o640, 'no-such-user', 'no-such-group')
+    assert not mock_getpwnam.called and not mock_getgrnam.called
+    mock_getpwnam.side_effect = KeyError('no-such-user')
+    with pytest.raises(KeyError):
+        node.validate()
+
+def test_compact_node_from_iterable():
+    """Test building CompactNodes from tuples and atts dicts."""
+    nodes = CompactNode.from_iterable([('/the/path/', 0o755),
+                                       ('/the/path/file', 0o644, 'nobody', 'nogroup'),
+                                       {'path' : '/the/path/other', 'owner' : 'nobody'}])
+    assert [node.path for node in nodes] == ['/the/path/', '/the/path/file', '/the/path/other']
+    assert nodes[0].is_dir
+    assert nodes[2].perms is None and nodes[2].owner == 'nobody'
+
+def test_compact_node_to_node():
+    """Test converting CompactNodes to File and Dir instances."""
+    the_dir, the_file = CompactNode.from_iterable([('/the/path/', 0o755), ('/the/path/file', 0o644)])
+    assert isinstance(the_dir.to_node(), Dir)
+    assert isinstance(the_file.to_node(), File)
+    assert the_file.to_node().perms == 0o644
+
+def test_compact_node_verify(tmpdir):
+    """Test verifying CompactNodes."""
+    tmpdir.join('file').write('')
+    tmpdir.join('file').chmod(0o640)
+    nodes = CompactNode.from_iterable([(str(tmpdir.join('file')), 0o640),
+                                       (str(tmpdir.join('missing')), 0o640)])
+    report = verify_many(nodes)
+    assert report[0].ok
+    assert report[1].failures == ['exists']
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_copier.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's copy engine.
+"""
+
+import errno
+import os
+
+import pytest
+
+from ext_pylib.files import Dir, copy_file, copy_tree
+from ext_pylib.files import copier
+
+
+@pytest.fixture()
+def tree(tmpdir):
+    """Sets up a source tree to copy."""
+    source = tmpdir.mkdir('source')
+    source.join('a.txt').write('File a...')
+    source.mkdir('sub').join('b.txt').write('File b...' * 1000)
+    source.join('sub').mkdir('deeper').join('c.txt').write('')
+    source.join('a.txt').chmod(0o640)
+    return source
+
+def test_copy_tree(tree, tmpdir):
+    """Test copying a nested tree into a new directory."""
+    destination = tmpdir.join('destination')
+    stats = copy_tree(str(tree), str(destination))
+    assert not stats.errors
+    assert stats.files == 3
+    assert stats.bytes == len('File a...') + len('File b...') * 1000
+    assert sum(stats.methods.values()) == 3
+    assert destination.join('a.txt').read() == 'File a...'
+    assert destination.join('sub', 'b.txt').read() == 'File b...' * 1000
+    assert destination.join('sub', 'deeper', 'c.txt').read() == ''
+    assert os.stat(str(destination.join('a.txt'))).st_mode & 511 == 0o640
+
+def test_copy_tree_bad_policy(tree, tmpdir):
+    """Test that copy_tree rejects an unknown policy."""
+    with pytest.raises(ValueError):
+        copy_tree(str(tree), str(tmpdir.join('destination')), policy='prompt')
+
+POLICIES = [
+    ('skip', 'Existing...', 'Existing...'),
+    ('overwrite', 'Existing...', 'File a...'),
+    ('newer', 'Existing...', 'File a...'),
+]
+@pytest.mark.parametrize(("policy", "existing", "expected"), POLICIES)
+def test_copy_tree_policies(tree, tmpdir, policy, existing, expected):
+    """Test what happens to files that already exist under each policy."""
+    destination = tmpdir.mkdir('destination')
+    destination.join('a.txt').write(existing)
+    os.utime(str(destination.join('a.txt')), (0, 0))  # Older than the source
+    stats = copy_tree(str(tree), str(destination), policy=policy)
+    assert not stats.errors
+    assert destination.join('a.txt').read() == expected
+    assert stats.skipped == (1 if policy == 'skip' else 0)
+
+def test_copy_tree_newer_skips_newer_destination(tree, tmpdir):
+    """Test that the 'newer' policy keeps files that are newer than the source."""
+    destination = tmpdir.mkdir('destination')
+    destination.join('a.txt').write('Newer...')
+    os.utime(str(tree.join('a.txt')), (0, 0))
+    stats = copy_tree(str(tree), str(destination), policy='newer')
+    assert destination.join('a.txt').read() == 'Newer...'
+    assert stats.skipped == 1
+
+def test_copy_tree_records_errors(tree, tmpdir):
+    """Test that errors are collected rather than raised."""
+    destination = tmpdir.mkdir('destination')
+    destination.mkdir('a.txt')  # A directory where a file should go
+    stats = copy_tree(str(tree), str(destination), policy='overwrite')
+    assert len(stats.errors) == 1
+    assert stats.errors[0][0] == str(tree.join('a.txt'))
+    assert stats.files == 2
+
+def test_copy_file_falls_back(tmpdir):
+    """Test that copy_file falls back when a fast path isn't supported."""
+    source = tmpdir.join('source')
+    source.write('The data...')
+    calls = []
+
+    def unsupported(source_fd, destination_fd, size):
+        """A fast path that writes some data and then fails."""
+        calls.append(size)
+        os.write(destination_fd, b'garbage')
+        raise OSError(errno.EXDEV, 'Cross-device link')
+
+    methods = [('fast', unsupported), ('read', copier._read_write)]  # pylint: disable=protected-access
+    assert copy_file(str(source), str(tmpdir.join('destination')), methods) == (11, 'read')
+    assert calls == [11]
+    assert tmpdir.join('destination').read() == 'The data...'
+
+def test_copy_file_raises_real_errors(tmpdir):
+    """Test that copy_file doesn't hide errors that aren't about support."""
+    source = tmpdir.join('source')
+    source.write('The data...')
+
+    def failing(source_fd, destination_fd, size):
+        """A fast path that fails for real."""
+        raise OSError(errno.EIO, 'I/O error')
+
+    with pytest.raises(OSError):
+        copy_file(str(source), str(tmpdir.join('destination')), [('fast', failing)])
+
+def test_copy_tree_replaces_destination_links(tree, tmpdir):
+    """Test that copy_tree replaces a link in the destination instead of
+    writing through it, and doesn't copy into a linked directory."""
+    outside = tmpdir.join('outside.txt')
+    outside.write('Outside...')
+    outside_dir = tmpdir.mkdir('outside')
+    destination = tmpdir.mkdir('destination')
+    destination.join('a.txt').mksymlinkto(outside)
+    destination.join('sub').mksymlinkto(outside_dir)
+    stats = copy_tree(str(tree), str(destination), 'overwrite')
+    assert outside.read() == 'Outside...'
+    assert not destination.join('a.txt').islink()
+    assert destination.join('a.txt').read() == 'File a...'
+    assert outside_dir.listdir() == []
+    assert [path for path, _ in stats.errors] == [str(tree.join('sub'))]
+
+def test_dir_fill_with_policy(tree, tmpdir):
+    """Test filling one Dir with another without prompting."""
+    destination = tmpdir.mkdir('destination')
+    destination.join('a.txt').write('Existing...')
+    the_dir = Dir({'path' : str(destination)})
+    assert the_dir.fill(Dir({'path' : str(tree)}), policy='skip')
+    assert destination.join('a.txt').read() == 'Existing...'
+    assert destination.join('sub', 'b.txt').read() == 'File b...' * 1000
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_create.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's create_many().
+"""
+
+import os
+
+from mock import patch
+import pytest
+
+from ext_pylib.files import File, create_many
+from ext_pylib.user import get_current_username, get_current_groupname
+
+
+def test_create_many(tmpdir):
+    """Test creating files (and their parent directories) in one batch."""
+    files = [File({'path' : str(tmpdir.join('site' + str(i), 'conf', 'file' + str(j))), 'perms' : 0o640})
+             for i in range(3) for j in range(4)]
+    files[0].data = 'The data...'
+    stats = create_many(files)
+    assert not stats.errors
+    assert stats.created == 12
+    assert stats.dirs == 6  # site0..2 and site0..2/conf
+    assert tmpdir.join('site0', 'conf', 'file0').read() == 'The data...'
+    assert tmpdir.join('site2', 'conf', 'file3').read() == ''
+    assert os.stat(files[5].path).st_mode & 511 == 0o640
+
+@patch('os.makedirs')
+def test_create_many_makes_each_dir_once(mock_makedirs, tmpdir):
+    """Test that each parent directory is only created once."""
+    mock_makedirs.side_effect = os.mkdir
+    files = [File({'path' : str(tmpdir.join('conf', 'file' + str(i)))}) for i in range(10)]
+    assert create_many(files).created == 10
+    mock_makedirs.assert_called_once_with(str(tmpdir.join('conf')))
+
+POLICIES = [
+    ('skip', 'Existing...', 1, 1),
+    ('overwrite', 'New...', 2, 0),
+]
+@pytest.mark.parametrize(("policy", "expected", "created", "skipped"), POLICIES)
+def test_create_many_policies(tmpdir, policy, expected, created, skipped):
+    """Test what happens to files that already exist under each policy."""
+    tmpdir.join('existing').write('Existing...')
+    files = [File({'path' : str(tmpdir.join('existing'))}), File({'path' : str(tmpdir.join('new'))})]
+    files[0].data = 'New...'
+    stats = create_many(files, policy)
+    assert tmpdir.join('existing').read() == expected
+    assert (stats.created, stats.skipped) == (created, skipped)
+
+def test_create_many_bad_policy():
+    """Test that create_many rejects an unknown policy."""
+    with pytest.raises(ValueError):
+        create_many([], 'prompt')
+
+@patch('os.fchown')
+@patch('os.fchmod')
+def test_create_many_sets_perms_and_owner_by_fd(mock_fchmod, mock_fchown, tmpdir):
+    """Test that permissions and ownership are set through the open fd."""
+    a_file = File({'path' : str(tmpdir.join('file')), 'perms' : 0o600,
+                   'owner' : get_current_username(), 'group' : get_current_groupname()})
+    with patch('os.chmod') as mock_chmod, patch('os.chown') as mock_chown:
+        assert create_many([a_file]).created == 1
+        assert not mock_chmod.called and not mock_chown.called
+    assert mock_fchmod.call_args[0][1] == 0o600
+    assert mock_fchown.call_args[0][1:] == (os.getuid(), os.getgid())
+
+def test_create_many_records_errors(tmpdir):
+    """Test that errors are collected rather than raised."""
+    tmpdir.join('not_a_dir').write('')
+    files = [File({'path' : str(tmpdir.join('not_a_dir', 'file'))}), File({'path' : str(tmpdir.join('file'))})]
+    stats = create_many(files)
+    assert stats.created == 1
+    assert [path for path, _ in stats.errors] == [str(tmpdir.join('not_a_dir', 'file'))]
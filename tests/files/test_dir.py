@@ -80,3 +80,52 @@ def test_dir_fill(mock_copytree, mock_exists):
     fill_with = Dir({'path' : '/another/test/dir/'})
     assert the_dir.fill(fill_with)
     mock_copytree.assert_called_once_with('/another/test/dir/', '/test/dir/')
+
+def test_dir_walk(tmpdir):
+    """Test lazily walking a directory tree as nodes."""
+    tmpdir.join('a.txt').write('')
+    tmpdir.join('b.log').write('')
+    tmpdir.mkdir('sub').join('c.txt').write('')
+    tmpdir.join('sub').mkdir('deeper').join('d.txt').write('')
+    the_dir = Dir({'path' : str(tmpdir)})
+    nodes = list(the_dir.walk())
+    assert sorted(node.path[len(str(tmpdir)) + 1:] for node in nodes) == \
+        ['a.txt', 'b.log', 'sub/', 'sub/c.txt', 'sub/deeper/', 'sub/deeper/d.txt']
+    assert all(isinstance(node, Dir) == node.path.endswith('/') for node in nodes)
+    paths = [node.path for node in nodes]
+    assert paths.index(str(tmpdir) + '/sub/') < paths.index(str(tmpdir) + '/sub/c.txt')
+
+WALK_ARGS = [
+    ({'include' : '*.txt'}, ['a.txt', 'sub/c.txt', 'sub/deeper/d.txt']),
+    ({'exclude' : ['*.log', 'deeper']}, ['a.txt', 'sub/', 'sub/c.txt']),
+    ({'exclude' : 'sub/deeper'}, ['a.txt', 'b.log', 'sub/', 'sub/c.txt']),
+    ({'max_depth' : 2, 'include' : '*.txt'}, ['a.txt', 'sub/c.txt']),
+]
+@pytest.mark.parametrize(("kwargs", "expected"), WALK_ARGS)
+def test_dir_walk_filters(tmpdir, kwargs, expected):
+    """Test walking a directory tree with filters and a max depth."""
+    tmpdir.join('a.txt').write('')
+    tmpdir.join('b.log').write('')
+    tmpdir.mkdir('sub').join('c.txt').write('')
+    tmpdir.join('sub').mkdir('deeper').join('d.txt').write('')
+    the_dir = Dir({'path' : str(tmpdir)})
+    assert sorted(node.path[len(str(tmpdir)) + 1:] for node in the_dir.walk(**kwargs)) == expected
+
+def test_dir_iterdir(tmpdir):
+    """Test iterating over just the entries of a directory."""
+    tmpdir.join('a.txt').write('')
+    tmpdir.mkdir('sub').join('c.txt').write('')
+    the_dir = Dir({'path' : str(tmpdir)})
+    assert sorted(node.name for node in the_dir.iterdir()) == ['a.txt', 'sub']
+
+def test_dir_walk_onerror(tmpdir):
+    """Test that invalid paths and unreadable directories go to onerror."""
+    tmpdir.join('a+b.txt').write('')
+    tmpdir.join('c.txt').write('')
+    errors = []
+    the_dir = Dir({'path' : str(tmpdir)})
+    assert [node.name for node in the_dir.walk(onerror=errors.append)] == ['c.txt']
+    assert isinstance(errors[0], ValueError)
+    missing = Dir({'path' : str(tmpdir.join('missing'))})
+    assert list(missing.walk(onerror=errors.append)) == []
+    assert isinstance(errors[1], OSError)
@@ -111,10 +111,9 @@ def test_file_create_and_create_parent_dirs(mock_exists, mock_chmod, mock_chown)
     mock_parent_dir = MockParentDir(False)
     mock_exists.return_value = False
     mock_chown.return_value = mock_chmod.return_value = True
-    File.parent_dir = mock_parent_dir
     the_file = File(DEFAULT_ARGS)
     m_open = mock_open()
-    with patch(BUILTINS + '.open', m_open, create=True):
+    with patch.object(File, 'parent_dir', mock_parent_dir), patch(BUILTINS + '.open', m_open, create=True):
         assert the_file.create()
         m_open.assert_called_once_with(DEFAULT_ARGS['path'], 'w')
         m_open().close.assert_called_once_with()
@@ -130,10 +129,9 @@ def test_file_create_with_data(mock_write, mock_exists, mock_chmod, mock_chown):
     mock_parent_dir = MockParentDir(True)
     mock_exists.return_value = False
     mock_chown.return_value = mock_chmod.return_value = True
-    File.parent_dir = mock_parent_dir
     the_file = File(DEFAULT_ARGS)
     m_open = mock_open()
-    with patch(BUILTINS + '.open', m_open, create=True):
+    with patch.object(File, 'parent_dir', mock_parent_dir), patch(BUILTINS + '.open', m_open, create=True):
         data = 'The data...'
         assert the_file.create(data)
         m_open.assert_called_once_with(DEFAULT_ARGS['path'], 'w')
@@ -151,10 +149,9 @@ def test_file_create_with_data_but_not_as_arg(mock_write, mock_exists, mock_chmo
     mock_parent_dir = MockParentDir(True)
     mock_exists.return_value = False
     mock_chown.return_value = mock_chmod.return_value = True
-    File.parent_dir = mock_parent_dir
     the_file = File(DEFAULT_ARGS)
     m_open = mock_open()
-    with patch(BUILTINS + '.open', m_open, create=True):
+    with patch.object(File, 'parent_dir', mock_parent_dir), patch(BUILTINS + '.open', m_open, create=True):
         data = 'The data...'
         the_file.data = data
         assert the_file.create()
@@ -268,3 +265,159 @@ def test_nonexisting_file_read_data(mock_exists):
     the_file = File(DEFAULT_ARGS)
     the_file.read()
     assert the_file.data == ''
+
+ITERLINES_ARGS = ['', 'one line', 'one line\n', 'first\nsecond', 'first\n\nthird\n', '\n\n']
+@pytest.mark.parametrize(("contents"), ITERLINES_ARGS)
+def test_file_iterlines(tmpdir, contents):
+    """Tests that iterlines() streams the same lines as readlines()."""
+    path = tmpdir.join('file')
+    path.write(contents)
+    the_file = File({'path' : str(path)})
+    assert list(the_file.iterlines()) == contents.split('\n')
+    assert the_file.data == ''  # Streaming doesn't populate memory
+    assert list(the_file.iterlines()) == the_file.readlines()
+
+def test_file_iter_chunks(tmpdir):
+    """Tests that iter_chunks() streams the file in chunks of size."""
+    path = tmpdir.join('file')
+    path.write('0123456789' * 3 + '012')
+    the_file = File({'path' : str(path)})
+    chunks = list(the_file.iter_chunks(10))
+    assert chunks == ['0123456789'] * 3 + ['012']
+    assert the_file.data == ''
+
+@patch('ext_pylib.files.node.Node.exists')
+def test_file_streaming_nonexisting_file(mock_exists):
+    """Tests that streaming a nonexisting file yields nothing."""
+    mock_exists.return_value = False
+    the_file = File(DEFAULT_ARGS)
+    assert list(the_file.iterlines()) == []
+    assert list(the_file.iter_chunks()) == []
+
+def test_file_mmap_find_and_findall(tmpdir):
+    """Tests find() and findall() over a memory map."""
+    path = tmpdir.join('file')
+    path.write('ServerName example.com\nDocumentRoot /var/www/example.com\n')
+    the_file = File({'path' : str(path), 'mmap' : True})
+    assert the_file.find('DocumentRoot') == 23
+    assert the_file.find('missing') == -1
+    assert 'ServerName' in the_file
+    assert the_file.findall('DocumentRoot (.*)') == ['/var/www/example.com']
+    assert the_file.findall('(\\w+)Name (.*)') == [('Server', 'example.com')]
+    assert the_file.data == ''  # Searching a map doesn't populate memory
+
+@pytest.mark.parametrize(("regex"), [
+    r'ServerName (\w+)', r'ServerName caf(.)', 'ServerName (café)', r'(?i)SERVERNAME (\w+)',
+    ])
+def test_file_mmap_findall_non_ascii(tmpdir, regex):
+    """Tests that findall() matches the same with and without mmap mode when
+    the file or the regex isn't ASCII."""
+    path = tmpdir.join('file')
+    path.write_text('Listen 80\nServerName café.com\n', 'utf-8')
+    the_file = File({'path' : str(path), 'mmap' : True})
+    assert the_file.findall(regex) == File({'path' : str(path)}).findall(regex)
+    assert the_file.data == ''
+
+def test_file_mmap_empty_and_nonexisting_file(tmpdir):
+    """Tests searching an empty or nonexisting file in mmap mode."""
+    path = tmpdir.join('file')
+    path.write('')
+    for the_file in [File({'path' : str(path), 'mmap' : True}),
+                     File({'path' : str(tmpdir.join('missing')), 'mmap' : True})]:
+        assert the_file.find('anything') == -1
+        assert the_file.findall('(.*)') == []
+
+def test_file_mmap_uses_data_in_memory(tmpdir):
+    """Tests that data in memory takes precedence over the memory map."""
+    path = tmpdir.join('file')
+    path.write('On disk.')
+    the_file = File({'path' : str(path), 'mmap' : True})
+    the_file.data = 'In memory.'
+    assert the_file.findall('In (.*)\\.') == ['memory']
+
+def test_file_appender(tmpdir):
+    """Tests buffering appends with an Appender."""
+    path = tmpdir.join('file')
+    path.write('First line.\n')
+    the_file = File({'path' : str(path)})
+    the_file.read()
+    m_open = mock_open()
+    with patch(BUILTINS + '.open', m_open, create=True):
+        with the_file.appender(max_bytes=100, max_delay=None) as appender:
+            for i in range(30):
+                appender.append('Line ' + str(i) + '\n')
+        assert m_open.call_count == 1  # The file is opened once
+        assert m_open().write.call_count == 3  # Once per 100 characters
+        m_open().close.assert_called_once_with()
+    lines = ''.join('Line ' + str(i) + '\n' for i in range(30))
+    assert the_file.data == 'First line.\n' + lines
+    assert ''.join(call[0][0] for call in m_open().write.call_args_list) == lines
+
+def test_file_appender_writes_to_disk(tmpdir):
+    """Tests that an Appender writes to disk and leaves data on disk."""
+    path = tmpdir.join('file')
+    the_file = File({'path' : str(path)})
+    appender = the_file.appender(max_delay=0)  # Writes out every append
+    appender.append('one\n')
+    assert path.read() == 'one\n'
+    appender.append('two\n')
+    appender.close()
+    assert path.read() == 'one\ntwo\n'
+    assert the_file.data == ''  # Nothing was in memory, so it's read from disk
+    assert the_file.read() == 'one\ntwo\n'
+
+def test_file_opened(tmpdir):
+    """Tests that chmod(), chown(), and check() use the open fd."""
+    tmpdir.join('file').write('The data...')
+    the_file = File({'path' : str(tmpdir.join('file')), 'perms' : 0o640})
+    with the_file.opened() as fd:
+        assert the_file.fd == fd
+        with the_file.opened() as inner_fd:  # Reuses the fd
+            assert inner_fd == fd
+        with patch('os.chmod') as mock_chmod, patch('os.chown') as mock_chown, \
+                patch('os.stat') as mock_stat, patch('os.path.exists') as mock_exists:
+            assert the_file.chmod()
+            assert the_file.chown()
+            assert the_file.check().ok
+            assert the_file.actual_perms == 0o640
+            assert not (mock_chmod.called or mock_chown.called or mock_stat.called or mock_exists.called)
+    assert the_file.fd is None
+
+def test_file_opened_write(tmpdir):
+    """Tests writing to a file through its open fd."""
+    the_file = File({'path' : str(tmpdir.join('file')), 'perms' : 0o600})
+    with the_file.opened(write=True):
+        assert the_file.write('The data...', False)
+        assert the_file.write(' More data...')
+        assert the_file.write('New data...', False)
+        assert the_file.chmod()
+    assert tmpdir.join('file').read() == 'New data...'
+    assert tmpdir.join('file').stat().mode & 511 == 0o600
+
+def test_file_create_sets_perms_through_handle(tmpdir):
+    """Tests that create() sets perms on the handle it created the file with."""
+    the_file = File({'path' : str(tmpdir.join('file')), 'perms' : 0o604})
+    with patch('os.chmod') as mock_chmod, patch('os.chown') as mock_chown:
+        assert the_file.create('The data...')
+        assert not (mock_chmod.called or mock_chown.called)
+    assert the_file.fd is None
+    assert tmpdir.join('file').read() == 'The data...'
+    assert tmpdir.join('file').stat().mode & 511 == 0o604
+
+def test_file_cache(tmpdir):
+    """Test that Files in cache mode share one copy, checked against the file."""
+    path = tmpdir.join('file')
+    path.write('The data...')
+    a_file, another_file = [File({'path' : str(path), 'cache' : True}) for _ in range(2)]
+    assert a_file.read() == 'The data...'
+    assert another_file.read() is a_file.read()
+    path.write('New data...!')
+    assert a_file.read() == 'New data...!'
+    a_file.data = 'Changed in memory...'  # Not written, so it is kept
+    path.write('Newer data...')
+    assert a_file.read() == 'Changed in memory...'
+    assert a_file.write(append=False)
+    path.write('Changed on disk...')
+    assert a_file.read() == 'Changed on disk...'
+    path.remove()
+    assert a_file.read() == ''
@@ -15,9 +15,11 @@ Integration tests for ext_pylib's file module.
 from __future__ import print_function, unicode_literals
 
 from datetime import datetime
+import os
 import pytest
 
 from ext_pylib.files import Dir, File, Section
+from ext_pylib.files.dir import copytree
 
 
 @pytest.fixture()
@@ -38,9 +40,16 @@ def root(request):
     return root_dir
 
 
-def test_copytree():
-    """TODO:"""
-    pass
+def test_copytree(tmpdir):
+    """[Integration Test] Test copying every item in a directory."""
+    source = tmpdir.mkdir('source')
+    source.join('a.txt').write('File a...')
+    source.join('b.txt').write('File b...')
+    source.mkdir('sub').join('c.txt').write('File c...')
+    destination = tmpdir.mkdir('destination')
+    assert copytree(str(source), str(destination))
+    assert sorted(os.listdir(str(destination))) == ['a.txt', 'b.txt', 'sub']
+    assert destination.join('sub', 'c.txt').read() == 'File c...'
 
 def test_dir_actual_create_and_remove():
     """[Integration Test] Test actual creation and removal of directory."""
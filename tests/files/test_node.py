@@ -15,13 +15,22 @@ A unit test for ext_pylib file module's Node class and methods.
 import pytest
 from mock import patch
 
-from ext_pylib.files.node import Node
-from ext_pylib.user import get_current_username, get_current_groupname
+from ext_pylib.files import Dir, File, exists_batch
+from ext_pylib.files.node import Node, normalize_paths, remember_exists
+from ext_pylib.user import get_current_username, get_current_groupname, invalidate_cache
 
 
 CURRENT_USER = get_current_username()
 CURRENT_GROUP = get_current_groupname()
 
+
+@pytest.fixture()
+def empty_name_cache(request):
+    """Empties the shared user/group cache so that mocked pwd and grp
+    functions are called (and their mocked entries don't leak out)."""
+    invalidate_cache()
+    request.addfinalizer(invalidate_cache)
+
 DEFUALT_ATTS = {'path' : '/etc/path/file'}
 
 INIT_ARGS = [
@@ -195,6 +204,7 @@ CHOWN_ARGS = [
     ({'path' : 'relative/path/file', 'owner' : None, 'group' : 'www-data'}, True),
 ]
 @pytest.mark.parametrize(("atts", "expected"), CHOWN_ARGS)
+@pytest.mark.usefixtures('empty_name_cache')
 @patch('ext_pylib.files.node.Node.exists')
 @patch('pwd.getpwnam')
 @patch('grp.getgrnam')
@@ -209,6 +219,7 @@ def test_node_chown(mock_chown, mock_getgrnam, mock_getpwnam, mock_path_exists,
     mock_path_exists.return_value = True # Assume this is working for this test
     mock_getpwnam(atts['owner']).pw_uid = 123 # Just a number to use for mocking
     mock_getgrnam(atts['group']).gr_gid = 123
+    invalidate_cache()  # Make sure chown() looks up the owner and group
     assert expected == node.chown()
     if atts['path'] is not None:
         mock_getpwnam.assert_called_with(CURRENT_USER if not atts['owner'] else atts['owner'])
@@ -258,6 +269,21 @@ def test_node_set_path_invalid_char(invalid_char):
     with pytest.raises(ValueError):
         node = Node({'path' : '/path/to' + invalid_char})
 
+def test_normalize_paths():
+    """Test validating and normalizing a batch of paths."""
+    assert normalize_paths([]) == []
+    assert normalize_paths(['/this//path/', 'relative///path/file', '/etc/path/file']) == \
+        ['/this/path/', 'relative/path/file', '/etc/path/file']
+    assert normalize_paths(iter(['//etc//path//file'])) == ['/etc/path/file']
+
+@pytest.mark.parametrize(('invalid_path'), [
+    (''), ('/path/to!'), ('/path/to\n'), ('/path/\0to'),
+])
+def test_normalize_paths_invalid(invalid_path):
+    """Test that normalize_paths() rejects a batch with an invalid path."""
+    with pytest.raises(ValueError):
+        normalize_paths(['/this/path/', invalid_path, '/etc/path/file'])
+
 PARENT_DIRS_ARGS = [
     ({'path' : None}, None),
     ({'path' : '/this/path/'}, '/this/'),
@@ -299,6 +325,72 @@ def test_node_parent_node_with_no_parents(atts):
     node = Node(atts)
     assert node.parent_node is None
 
+def test_node_parent_node_shared():
+    """Tests that parent nodes are remembered and shared by siblings."""
+    node = Node({'path' : '/shared/path/file'})
+    sibling = Node({'path' : '/shared/path/other'})
+    assert node.parent_node is node.parent_node
+    assert node.parent_node is sibling.parent_node
+    node.path = '/another/path/file'
+    assert node.parent_node.path == '/another/path/'
+    assert sibling.parent_node.path == '/shared/path/'
+
+def test_dir_and_file_parent_dir_shared():
+    """Tests that File and Dir share their parent Dir."""
+    a_file = File({'path' : '/shared/path/file'})
+    a_dir = Dir({'path' : '/shared/path/dir/'})
+    assert isinstance(a_file.parent_dir, Dir)
+    assert a_file.parent_dir is a_dir.parent_dir
+    assert a_file.parent_dir.path == '/shared/path/'
+
+@patch('os.path.exists')
+def test_node_exists_batch(mock_path_exists):
+    """Tests that each path is checked only once within exists_batch()."""
+    mock_path_exists.return_value = False
+    with exists_batch():
+        assert not Node({'path' : '/the/path/file'}).exists()
+        assert not Node({'path' : '/the/path/file'}).exists()
+        with exists_batch():  # Nested batches share the outer memo
+            assert not Node({'path' : '/the/path/file'}).exists()
+        remember_exists('/the/path/file', True)
+        assert Node({'path' : '/the/path/file'}).exists()
+    mock_path_exists.assert_called_once_with('/the/path/file')
+    assert not Node({'path' : '/the/path/file'}).exists()
+    assert mock_path_exists.call_count == 2
+
+@patch('os.path.exists')
+def test_node_exists_batch_remember(mock_path_exists):
+    """Tests that creating or removing a path updates the memo."""
+    mock_path_exists.return_value = False
+    with exists_batch():
+        assert not Node({'path' : '/the/'}).exists()
+        assert not Node({'path' : '/the/path/'}).exists()
+        remember_exists('/the/path/dir/', True)  # Created with its parents
+        assert Node({'path' : '/the/'}).exists()
+        assert Node({'path' : '/the/path/'}).exists()
+        remember_exists('/the/', False)  # Removed with its children
+        assert not Node({'path' : '/the/path/dir/'}).exists()
+    assert mock_path_exists.call_count == 3
+
+@patch('os.path.exists')
+def test_node_exists_batch_remove_siblings(mock_path_exists):
+    """Tests that removing a path only forgets the paths under it, not
+    siblings whose names start with its name."""
+    mock_path_exists.return_value = True
+    with exists_batch():
+        assert Node({'path' : '/the/path/'}).exists()
+        assert Node({'path' : '/the/path/file'}).exists()
+        assert Node({'path' : '/the/path2/'}).exists()
+        assert Node({'path' : '/the/file'}).exists()
+        assert Node({'path' : '/the/file2'}).exists()
+        remember_exists('/the/path/', False)
+        remember_exists('/the/file', False)
+        mock_path_exists.return_value = False
+        assert not Node({'path' : '/the/path/file'}).exists()  # Checked again
+        assert Node({'path' : '/the/path2/'}).exists()
+        assert Node({'path' : '/the/file2'}).exists()
+    assert mock_path_exists.call_count == 6
+
 def test_node_set_perms_invalid():
     """Tests setting node's perms as invalid values."""
     node = Node(DEFUALT_ATTS)
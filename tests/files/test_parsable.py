@@ -15,6 +15,7 @@ A unit test for ext_pylib file module's Parsable mixin class.
 import pytest
 from . import utils
 
+from ext_pylib import files
 from ext_pylib.files import File, Parsable
 
 
@@ -86,3 +87,120 @@ def test_parsable_setup_parsing_on_empty_file():
     assert the_file.secure is None
     the_file.secure = 'True'
     assert the_file.secure == 'True'
+
+def test_parsable_mmap(tmpdir):
+    """Test Parsable attributes on a memory-mapped file."""
+    path = tmpdir.join('file')
+    path.write(FILE)
+    the_file = ParsableFile({'path' : str(path), 'mmap' : True})
+    the_file.setup_parsing({
+        'htdocs' : 'DocumentRoot (.*)',
+        'debug'  : 'DEBUG = (.*)',
+    })
+    assert the_file.htdocs == ['/var/www/google.com', '/var/www/example.com']
+    assert the_file.debug == 'True'
+    assert the_file.data == ''
+    the_file.debug = 'DEBUG = False'  # Setting loads the data into memory
+    assert the_file.debug == 'False'
+    assert the_file.data != ''
+
+def test_parsable_mmap_non_ascii(tmpdir):
+    """Test Parsable attributes on a memory-mapped file that isn't ASCII."""
+    path = tmpdir.join('file')
+    path.write_text('ServerName café.com\n', 'utf-8')
+    the_file = ParsableFile({'path' : str(path), 'mmap' : True})
+    the_file.setup_parsing({'server' : r'ServerName (\w+)', 'letter' : r'ServerName caf(.)'})
+    assert the_file.server == 'café'
+    assert the_file.letter == 'é'
+
+PARSE_ALL_REGEXES = {
+    'htdocs' : ('DocumentRoot (.*)',),
+    'debug'  :  'DEBUG = (.*)',
+    'secure' : ('SECURE[ ]*=[ ]*([^ \n]*)', 'SECURE = {0}'),
+    'speed'  : ('SPEED[ ]*=[ ]*([^ \n]*)', 'SPEED = {0}'),
+    'list'   : ('(LIST)[ ]*=[ ]*([^ \n]*)', 'LIST = {0}'),
+    'sample' :  'sample file',
+}
+
+def test_parsable_parse_all():
+    """Test Parsable parse_all() method returns what each attribute does."""
+    the_file = Parsable()
+    Parsable.read = utils.mock_read_data
+    the_file.data = FILE
+    the_file.setup_parsing(PARSE_ALL_REGEXES)
+    parsed = the_file.parse_all()
+    assert parsed == dict((attribute, getattr(the_file, attribute)) for attribute in PARSE_ALL_REGEXES)
+    assert parsed['list'] == [('LIST', 'first_item'), ('LIST', 'second_item')]
+    assert parsed['speed'] is None
+    assert len(parsed['sample']) == 4
+
+@pytest.mark.parametrize(("data", "regexes"), [
+    ('listen 80 ssl\nlisten 443 ssl\n', {'port' : r'listen (\d+)', 'ssl' : r'listen \d+ (ssl)'}),
+    ('aaaa', {'pairs' : 'aa', 'singles' : 'a', 'empty' : 'x*'}),
+    ('DEBUG = True\n', {'key' : r'(\w+) =', 'line' : r'(\w+) = (.*)', 'value' : '= (.*)'}),
+    ])
+def test_parsable_parse_all_overlapping(data, regexes):
+    """Test Parsable parse_all() method with regexes whose matches overlap."""
+    the_file = Parsable()
+    Parsable.read = utils.mock_read_data
+    the_file.data = data
+    the_file.setup_parsing(regexes)
+    assert the_file.parse_all() == dict((attribute, getattr(the_file, attribute)) for attribute in regexes)
+
+def test_parsable_parse_all_uncombinable():
+    """Test Parsable parse_all() method with regexes that can't be combined."""
+    the_file = Parsable()
+    Parsable.read = utils.mock_read_data
+    the_file.data = 'KEY = KEY\nOTHER = VALUE\n'
+    the_file.setup_parsing({
+        'same'  : r'(\w+) = \1',
+        'other' : 'OTHER = (.*)',
+    })
+    assert the_file.parse_all() == {'same' : 'KEY', 'other' : 'VALUE'}
+
+def test_parsable_file_index():
+    """Test that ParsableFile attributes read and write through its index the
+    same as an unindexed Parsable does."""
+    indexed, unindexed = files.ParsableFile(), Parsable()
+    Parsable.read = utils.mock_read_data
+    indexed.data = unindexed.data = FILE
+    indexed.setup_parsing(PARSE_ALL_REGEXES)
+    unindexed.setup_parsing(PARSE_ALL_REGEXES)
+    assert indexed.indexed and not unindexed.indexed
+    changes = [('secure', 'True'), ('speed', 'fast'), ('htdocs', '/var/www/\\1'),
+               ('list', 'LIST = only'), ('speed', 'faster'), ('debug', 'DEBUG = False')]
+    for attribute, value in changes:
+        setattr(indexed, attribute, value)
+        setattr(unindexed, attribute, value)
+        assert indexed.data == unindexed.data
+        for name in PARSE_ALL_REGEXES:
+            assert getattr(indexed, name) == getattr(unindexed, name)
+
+def test_parsable_file_index_regex_matching_newlines():
+    """Test that a regex that can match a newline without saying '\n' isn't
+    kept in the index when another attribute is edited."""
+    indexed, unindexed = files.ParsableFile(), Parsable()
+    Parsable.read = utils.mock_read_data
+    indexed.data = unindexed.data = 'aa\nbb\ncc'
+    regexes = {'everything' : r'[\x00-z]+', 'middle' : r'\nb(b)', 'octal' : r'a\012b', 'tab' : r'[\t-z]+'}
+    indexed.setup_parsing(regexes)
+    unindexed.setup_parsing(regexes)
+    for name in regexes:
+        assert getattr(indexed, name) == getattr(unindexed, name)
+    indexed.middle = unindexed.middle = '{'
+    assert indexed.data == unindexed.data
+    for name in regexes:
+        assert getattr(indexed, name) == getattr(unindexed, name)
+
+def test_parsable_file_index_reads_once():
+    """Test that ParsableFile only scans the data once per attribute."""
+    the_file = files.ParsableFile()
+    the_file.data = FILE
+    the_file.setup_parsing({'debug' : 'DEBUG = (.*)'})
+    assert the_file.debug == 'True'
+    index = the_file.get_parse_index()
+    matches = index.matches['debug']
+    assert the_file.debug == 'True'
+    assert index.matches['debug'] is matches  # Not rescanned
+    the_file.data = FILE.replace('True', 'Yes')  # New data starts the index over
+    assert the_file.debug == 'Yes'
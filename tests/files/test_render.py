@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_render.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's render_many().
+"""
+
+import os
+
+from mock import patch
+
+from ext_pylib.files import TemplateFile, render_many
+
+
+TEMPLATE = """<VirtualHost *:80>
+    ServerName #DOMAIN#
+    DocumentRoot /var/www/#DOMAIN#/htdocs
+</VirtualHost>
+"""
+
+def jobs(tmpdir, count):
+    """Yields (placeholders, path) render jobs."""
+    for i in range(count):
+        domain = 'site' + str(i) + '.com'
+        yield {'#DOMAIN#' : domain}, str(tmpdir.join(domain + '.conf'))
+
+def test_render_many(tmpdir):
+    """Test rendering a template to many files."""
+    stats = render_many(TEMPLATE, jobs(tmpdir, 20), workers=4, perms=0o640, batch_size=7)
+    assert not stats.errors
+    assert stats.rendered == 20
+    assert stats.bytes == sum(len(TEMPLATE.replace('#DOMAIN#', 'site' + str(i) + '.com')) for i in range(20))
+    assert tmpdir.join('site13.com.conf').read() == TEMPLATE.replace('#DOMAIN#', 'site13.com')
+    assert os.stat(str(tmpdir.join('site0.com.conf'))).st_mode & 511 == 0o640
+
+def test_render_many_batches_directory_fsyncs(tmpdir):
+    """Test that the output directory is fsync'ed once per batch."""
+    with patch('ext_pylib.files.atomic.fsync_dir') as mock_fsync_dir:
+        render_many(TEMPLATE, jobs(tmpdir, 10), batch_size=4)
+    assert mock_fsync_dir.call_count == 3
+
+def test_render_many_records_errors(tmpdir):
+    """Test that errors (e.g. a missing placeholder value) are collected."""
+    bad_jobs = [({'#DOMAIN#' : 'good.com'}, str(tmpdir.join('good.conf'))),
+                ({'#DOMAIN#' : 'bad.com'}, str(tmpdir.join('missing', 'bad.conf')))]
+    stats = render_many(TEMPLATE, bad_jobs, sync=False)
+    assert stats.rendered == 1
+    assert [path for path, _ in stats.errors] == [str(tmpdir.join('missing', 'bad.conf'))]
+
+def test_templatefile_render_many(tmpdir):
+    """Test rendering a TemplateFile to many files."""
+    tmpdir.join('template').write(TEMPLATE)
+    the_file = TemplateFile({'path' : str(tmpdir.join('template'))})
+    assert the_file.render_many(jobs(tmpdir, 3)).rendered == 3
+    assert tmpdir.join('site2.com.conf').read() == the_file.apply_using({'#DOMAIN#' : 'site2.com'})
@@ -12,10 +12,12 @@
 A unit test for ext_pylib file module's Section mixin class.
 """
 
+from mock import patch
 import pytest
 from . import utils
 
-from ext_pylib.files import Section
+from ext_pylib.files import File, Section, SectionFile, apply_sections, apply_sections_to, splice_section
+from ext_pylib.files.sections import _contains
 
 
 SECTION_STR = """## START SECTION Test
@@ -141,3 +143,191 @@ def test_section_end_section_property():
     assert section_file.end_section == "This is the last line."
     section_file.read = utils.mock_read(MULTILINE_STR_WITH_RETURN)
     assert section_file.end_section == "This is the last line."
+
+def test_section_markers_are_cached():
+    """Test that the start and end markers are only found once per data."""
+    section_file = SectionFile({'path' : '/the/path/section'})
+    section_file.data = SECTION_STR
+    with patch.object(SectionFile, 'readlines') as mock_readlines:
+        assert section_file.start_section == '## START SECTION Test'
+        assert section_file.end_section == '## END SECTION Test'
+        markers = section_file._markers  # pylint: disable=protected-access
+        assert section_file.apply_to(FILE_HAS_SECTION_STR, overwrite=True) == FILE_WITH_SECTION_STR
+        assert section_file._markers is markers  # pylint: disable=protected-access
+        assert not mock_readlines.called
+    section_file.data = MULTILINE_STR
+    assert section_file.start_section == 'This is the first line.'
+    assert section_file.end_section == 'This is the last line.'
+
+def test_section_end_section_property_one_line():
+    """Test Section end_section property with a single line."""
+    section_file = Section()
+    section_file.read = utils.mock_read('Just one line.')
+    assert section_file.start_section == 'Just one line.'
+    with pytest.raises(ValueError):
+        assert section_file.end_section
+
+def test_section_is_in_mmap_file(tmpdir):
+    """Test Section is_in and is_applied methods on a memory-mapped File."""
+    section_file = Section()
+    section_file.read = utils.mock_read(SECTION_STR)
+    path = tmpdir.join('file')
+    path.write(FILE_WITH_SECTION_STR)
+    target = File({'path' : str(path), 'mmap' : True})
+    assert section_file.is_in(target)
+    assert section_file.is_applied(target)
+    assert target.data == ''
+    path.write(FILE_WITHOUT_SECTION_STR)
+    assert not section_file.is_in(target)
+    assert section_file.apply_to(target) == FILE_WITHOUT_SECTION_STR + '\n' + SECTION_STR + '\n'
+
+OTHER_SECTION_STR = """# START Other
+Other section.
+# END Other"""
+
+def make_section(data):
+    """Returns a Section with data."""
+    section_file = Section()
+    section_file.read = utils.mock_read(data)
+    return section_file
+
+@pytest.mark.parametrize(("data"), [
+    FILE_WITH_SECTION_STR, FILE_HAS_SECTION_STR, FILE_WITHOUT_SECTION_STR,
+    FILE_WITH_SECTION_STR + '\n' + OTHER_SECTION_STR.replace('Other section.', 'Changed.') + '\n',
+])
+def test_apply_sections(data):
+    """Test that apply_sections() matches apply_to() applied in turn."""
+    sections = [make_section(SECTION_STR), make_section(OTHER_SECTION_STR)]
+    expected = data
+    for section_file in sections:
+        expected = section_file.apply_to(expected, overwrite=True)
+    result, changed = apply_sections(data, sections, overwrite=True)
+    assert result == expected
+    assert [section_file.read() for section_file in changed] == \
+        [section_file.read() for section_file in sections if section_file.apply_to(data, True) != data]
+
+@pytest.mark.parametrize(("bodies"), [
+    [SECTION_STR, SECTION_STR],
+    ['# START Outer\n' + SECTION_STR + '\n# END Outer', SECTION_STR],
+])
+def test_apply_sections_applied_in_same_call(bodies):
+    """Test that apply_sections(), like apply_to() in turn, doesn't apply a
+    section again that a section before it in the same call wrote."""
+    sections = [make_section(body) for body in bodies]
+    expected = FILE_WITHOUT_SECTION_STR
+    for section_file in sections:
+        expected = section_file.apply_to(expected, overwrite=True)
+    result, changed = apply_sections(FILE_WITHOUT_SECTION_STR, sections, overwrite=True)
+    assert result == expected
+    assert changed == sections[:1]
+
+def test_apply_sections_unchanged():
+    """Test that apply_sections() returns the same data when nothing changes."""
+    data = FILE_WITH_SECTION_STR + '\n' + OTHER_SECTION_STR + '\n'
+    result, changed = apply_sections(data, [make_section(SECTION_STR), make_section(OTHER_SECTION_STR)])
+    assert result is data
+    assert changed == []
+
+@pytest.mark.parametrize(("data"), [
+    FILE_HAS_SECTION_STR + SECTION_STR + '\n',
+    FILE_BAD_SECTION_STR + SECTION_STR + '\n',
+    ])
+def test_apply_sections_applied_later(data):
+    """Test that apply_sections(), like apply_to(), leaves data alone if the
+    section is applied after a different copy of it."""
+    section = make_section(SECTION_STR)
+    assert section.apply_to(data, overwrite=True) == data
+    for overwrite in [False, True]:
+        assert apply_sections(data, [section], overwrite) == (data, [])
+
+def test_apply_sections_bad_data():
+    """Test apply_sections() with bad data or without overwrite."""
+    sections = [make_section(SECTION_STR)]
+    with pytest.raises(ValueError):
+        apply_sections(FILE_BAD_SECTION_STR, sections, overwrite=True)
+    with pytest.raises(ValueError):
+        apply_sections(FILE_BAD_SECTION2_STR, sections, overwrite=True)
+    with pytest.raises(ValueError):
+        apply_sections(FILE_HAS_SECTION_STR, sections)
+
+def test_apply_sections_to(tmpdir):
+    """Test that apply_sections_to() only writes the target if it changed."""
+    path = tmpdir.join('file')
+    path.write(FILE_WITHOUT_SECTION_STR)
+    target = File({'path' : str(path)})
+    sections = [make_section(SECTION_STR)]
+    assert apply_sections_to(target, sections) == sections
+    assert path.read() == FILE_WITHOUT_SECTION_STR + '\n' + SECTION_STR + '\n'
+    path.setmtime(1)
+    assert apply_sections_to(File({'path' : str(path)}), sections) == []
+    assert path.mtime() == 1
+
+@pytest.mark.parametrize(("data", "overwrite"), [
+    (FILE_WITHOUT_SECTION_STR, False),
+    (FILE_HAS_SECTION_STR, True),
+    (FILE_WITH_SECTION_STR, True),
+    ('Before: ' + SECTION_STR + ' after.\nThe next line.\n', False),
+    ('Before: ' + SECTION_STR.replace('second', '2nd') + ' after.\nThe next line.\n', True),
+    (OTHER_SECTION_STR + '\n' + FILE_HAS_SECTION_STR, True),
+    ])
+def test_splice_section(tmpdir, data, overwrite):
+    """Test that splice_section() writes the same result as apply_to()."""
+    section = make_section(SECTION_STR)
+    path = tmpdir.join('file')
+    path.write(data)
+    expected = section.apply_to(data, overwrite)
+    assert splice_section(section, str(path), overwrite=overwrite) == (expected != data)
+    assert path.read() == expected
+    assert tmpdir.listdir() == [path]
+
+@pytest.mark.parametrize(("data"), [
+    FILE_HAS_SECTION_STR + SECTION_STR + '\n',
+    FILE_BAD_SECTION_STR + SECTION_STR + '\n',
+    ])
+def test_splice_section_applied_later(tmpdir, data):
+    """Test that splice_section(), like apply_to(), leaves the target alone
+    if the section is applied after a different copy of it."""
+    path, output = tmpdir.join('file'), tmpdir.join('output')
+    path.write(data)
+    section = make_section(SECTION_STR)
+    assert section.apply_to(data, overwrite=True) == data
+    for overwrite in [False, True]:
+        assert not splice_section(section, str(path), overwrite=overwrite)
+        assert path.read() == data
+        assert not splice_section(section, str(path), str(output), overwrite)
+        assert output.read() == data
+
+def test_splice_section_unchanged(tmpdir):
+    """Test that splice_section() leaves the target untouched if the section
+    is already applied, but still writes output."""
+    path, output = tmpdir.join('file'), tmpdir.join('output')
+    path.write(FILE_WITH_SECTION_STR)
+    path.setmtime(1)
+    section = make_section(SECTION_STR)
+    assert not section.splice_into(File({'path' : str(path)}))
+    assert path.mtime() == 1
+    assert not section.splice_into(str(path), str(output))
+    assert output.read() == FILE_WITH_SECTION_STR
+
+@pytest.mark.parametrize(("data", "overwrite"), [
+    (FILE_BAD_SECTION_STR, True),
+    (FILE_BAD_SECTION2_STR, True),
+    (FILE_HAS_SECTION_STR, False),
+    ])
+def test_splice_section_bad_data(tmpdir, data, overwrite):
+    """Test that splice_section() raises ValueError (and leaves the target
+    untouched) with bad data or without overwrite."""
+    path = tmpdir.join('file')
+    path.write(data)
+    with pytest.raises(ValueError):
+        splice_section(make_section(SECTION_STR), str(path), overwrite=overwrite)
+    assert path.read() == data
+    assert tmpdir.listdir() == [path]
+
+def test_contains_across_chunks(tmpdir):
+    """Test that a section split across chunks is still found."""
+    path = tmpdir.join('file')
+    path.write(FILE_WITH_SECTION_STR)
+    for size in [1, 7, 64, 1048576]:
+        assert _contains(str(path), SECTION_STR, size)
+        assert not _contains(str(path), SECTION_STR + '!', size)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_sync.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's incremental directory syncs.
+"""
+
+import os
+
+from mock import patch
+import pytest
+
+from ext_pylib.files import Dir, build_manifest, sync_tree
+from ext_pylib.files.sync import load_manifests
+
+
+@pytest.fixture()
+def tree(tmpdir):
+    """Sets up a source tree to sync."""
+    source = tmpdir.mkdir('source')
+    source.join('a.txt').write('File a...')
+    source.mkdir('sub').join('b.txt').write('File b...')
+    source.mkdir('empty')
+    return source
+
+def test_build_manifest(tree):
+    """Test building a manifest of a directory."""
+    manifest = build_manifest(str(tree))
+    assert sorted(manifest) == ['a.txt', 'empty', 'sub', 'sub/b.txt']
+    assert manifest['sub'] is None
+    assert manifest['a.txt'][0] == len('File a...')
+    assert manifest['a.txt'][2] is None
+    assert build_manifest(str(tree), checksum=True)['a.txt'][2] is not None
+
+def test_sync_tree(tree, tmpdir):
+    """Test syncing into a new directory and then syncing again."""
+    destination = tmpdir.join('destination')
+    stats = sync_tree(str(tree), str(destination))
+    assert not stats.errors
+    assert stats.files == 2
+    assert destination.join('sub', 'b.txt').read() == 'File b...'
+    assert destination.join('empty').check(dir=1)
+
+    stats = sync_tree(str(tree), str(destination))
+    assert stats.files == 0
+    assert stats.skipped == 2
+
+    tree.join('a.txt').write('Changed...')
+    stats = sync_tree(str(tree), str(destination))
+    assert stats.files == 1
+    assert destination.join('a.txt').read() == 'Changed...'
+
+def test_sync_tree_delete(tree, tmpdir):
+    """Test that extraneous files are only removed with delete."""
+    destination = tmpdir.mkdir('destination')
+    destination.join('extra.txt').write('Extra...')
+    destination.mkdir('extra').join('c.txt').write('File c...')
+    sync_tree(str(tree), str(destination))
+    assert destination.join('extra.txt').check()
+    stats = sync_tree(str(tree), str(destination), delete=True)
+    assert not stats.errors
+    assert stats.deleted == 3
+    assert sorted(os.listdir(str(destination))) == ['a.txt', 'empty', 'sub']
+
+def test_sync_tree_checksum(tree, tmpdir):
+    """Test that checksum mode compares contents rather than mtimes."""
+    destination = tmpdir.join('destination')
+    sync_tree(str(tree), str(destination))
+    os.utime(str(destination.join('a.txt')), (0, 0))
+    assert sync_tree(str(tree), str(destination), checksum=True).files == 0
+    destination.join('a.txt').write('File A...')  # Same size
+    assert sync_tree(str(tree), str(destination), checksum=True).files == 1
+    assert destination.join('a.txt').read() == 'File a...'
+
+def test_sync_tree_manifest(tree, tmpdir):
+    """Test that a saved manifest keeps repeat checksum syncs from hashing."""
+    destination = tmpdir.join('destination')
+    manifest = str(tmpdir.join('manifest'))
+    sync_tree(str(tree), str(destination), checksum=True, manifest=manifest)
+    source_manifest, destination_manifest = load_manifests(manifest)
+    assert source_manifest['a.txt'] == destination_manifest['a.txt']
+    with patch('ext_pylib.files.sync.file_hash') as mock_hash:
+        stats = sync_tree(str(tree), str(destination), checksum=True, manifest=manifest)
+        assert not mock_hash.called
+    assert stats.files == 0
+
+def test_sync_tree_follows_links(tree, tmpdir):
+    """Test that links in the source are followed, as copy_tree() does, and
+    that a link to a parent directory is skipped."""
+    outside = tmpdir.mkdir('outside')
+    outside.join('c.txt').write('File c...')
+    tree.join('linked_dir').mksymlinkto(outside)
+    tree.join('linked_file').mksymlinkto(tree.join('a.txt'))
+    tree.join('sub', 'loop').mksymlinkto(tree)
+    destination = tmpdir.join('destination')
+    stats = sync_tree(str(tree), str(destination))
+    assert not stats.errors
+    assert destination.join('linked_dir', 'c.txt').read() == 'File c...'
+    assert destination.join('linked_file').read() == 'File a...'
+    assert not destination.join('linked_dir').islink()
+    assert not destination.join('sub', 'loop').check()
+    assert sync_tree(str(tree), str(destination)).files == 0
+
+def test_sync_tree_delete_keeps_linked_contents(tree, tmpdir):
+    """Test that deleting never follows a link in the destination."""
+    outside = tmpdir.mkdir('outside')
+    outside.join('c.txt').write('File c...')
+    destination = tmpdir.mkdir('destination')
+    destination.join('linked_dir').mksymlinkto(outside)
+    assert not sync_tree(str(tree), str(destination), delete=True).errors
+    assert not destination.join('linked_dir').check(link=1)
+    assert outside.join('c.txt').read() == 'File c...'
+
+def test_sync_tree_replaces_destination_links(tree, tmpdir):
+    """Test that a link in the destination is replaced by the source's file
+    or directory instead of being written through."""
+    outside = tmpdir.mkdir('outside')
+    outside.join('a.txt').write('Outside...')
+    destination = tmpdir.mkdir('destination')
+    destination.join('a.txt').mksymlinkto(outside.join('a.txt'))
+    destination.join('sub').mksymlinkto(outside)
+    assert build_manifest(str(destination)) == {'a.txt' : 'link', 'sub' : 'link'}
+    stats = sync_tree(str(tree), str(destination))
+    assert not stats.errors
+    assert outside.listdir() == [outside.join('a.txt')]
+    assert outside.join('a.txt').read() == 'Outside...'
+    assert not destination.join('a.txt').islink()
+    assert destination.join('a.txt').read() == 'File a...'
+    assert not destination.join('sub').islink()
+    assert destination.join('sub', 'b.txt').read() == 'File b...'
+
+def test_load_manifests_corrupt(tmpdir):
+    """Test that an unreadable manifest is treated as empty."""
+    tmpdir.join('manifest').write('Not a manifest...')
+    assert load_manifests(str(tmpdir.join('manifest'))) == ({}, {})
+    assert load_manifests(str(tmpdir.join('missing'))) == ({}, {})
+
+def test_dir_sync_from(tree, tmpdir):
+    """Test syncing one Dir with another."""
+    destination = tmpdir.mkdir('destination')
+    destination.join('extra.txt').write('Extra...')
+    the_dir = Dir({'path' : str(destination)})
+    assert the_dir.sync_from(Dir({'path' : str(tree)}), delete=True)
+    assert sorted(os.listdir(str(destination))) == ['a.txt', 'empty', 'sub']
@@ -10,9 +10,11 @@
 A unit test for ext_pylib file module's Template mixin class.
 """
 
+import os
+
 from . import utils
 
-from ext_pylib.files import Template
+from ext_pylib.files import CompiledTemplate, Template, TemplateFile
 
 
 TEMPLATE_FILE = """This is a test template file.
@@ -42,3 +44,41 @@ def test_templatefile_apply_using():
         '#DATA#' : 'www.google.com',
         '#MISSING#' : 'Nothing here.',
     })
+
+def test_templatefile_apply_using_is_one_pass():
+    """Test that values aren't searched for placeholders and that longer
+    placeholders win over the ones they contain."""
+    the_file = Template()
+    the_file.read = utils.mock_read('#A# #AB# #B#')
+    assert the_file.apply_using({'#A#' : '#B#', '#AB#' : 'ab', '#B#' : 'b', '' : 'x'}) == '#B# ab b'
+
+def test_compiled_template():
+    """Test rendering a CompiledTemplate many times."""
+    template = CompiledTemplate(TEMPLATE_FILE, ['#PLACEHOLDER#', '#DATA#'])
+    assert len(template.slots) == 6
+    for _ in range(3):
+        assert EXPECTED_RESULT == template.render({'#PLACEHOLDER#' : 'The placeholder text.',
+                                                   '#DATA#' : 'www.google.com'})
+    assert CompiledTemplate('No placeholders.', []).render({}) == 'No placeholders.'
+
+def test_template_compile_is_cached():
+    """Test that compile() is cached per set of placeholders until the data changes."""
+    the_file = Template()
+    the_file.read = utils.mock_read(TEMPLATE_FILE)
+    compiled = the_file.compile({'#DATA#' : 'a'})
+    assert the_file.compile({'#DATA#' : 'b'}) is compiled
+    assert the_file.compile({'#DATA#' : 'b', '#PLACEHOLDER#' : 'c'}) is not compiled
+    the_file.read = utils.mock_read(TEMPLATE_FILE + 'More data...')
+    assert the_file.compile({'#DATA#' : 'a'}) is not compiled
+
+def test_templatefile_compile_mtime(tmpdir):
+    """Test that a TemplateFile is read again when its mtime changes."""
+    tmpdir.join('template').write('Hello #NAME#.')
+    the_file = TemplateFile({'path' : str(tmpdir.join('template'))})
+    assert the_file.apply_using({'#NAME#' : 'world'}) == 'Hello world.'
+    tmpdir.join('template').write('Goodbye #NAME#.')
+    os.utime(str(tmpdir.join('template')), (1, 1))
+    assert the_file.apply_using({'#NAME#' : 'world'}) == 'Goodbye world.'
+    the_file.data = 'Changed in memory, #NAME#.'
+    os.utime(str(tmpdir.join('template')), (2, 2))
+    assert the_file.apply_using({'#NAME#' : 'world'}) == 'Changed in memory, world.'
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_tree.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's recursive chmod and chown.
+"""
+
+import errno
+import os
+
+from mock import patch
+import pytest
+
+from ext_pylib.files import Dir
+from ext_pylib.files import tree as tree_module
+from ext_pylib.files.tree import chmod_tree, chown_tree
+
+
+@pytest.fixture(params=[True, False], ids=['fwalk', 'walk'])
+def tree(request, tmpdir):
+    """Sets up a tree (walked with and without directory fds)."""
+    patcher = patch('ext_pylib.files.tree._use_fwalk', return_value=request.param)
+    patcher.start()
+    request.addfinalizer(patcher.stop)
+    tmpdir.join('a.txt').write('')
+    tmpdir.mkdir('sub').join('b.txt').write('')
+    tmpdir.join('sub', 'link').mksymlinkto(tmpdir.join('a.txt'))
+    tmpdir.chmod(0o755)
+    tmpdir.join('a.txt').chmod(0o644)
+    tmpdir.join('sub').chmod(0o700)
+    tmpdir.join('sub', 'b.txt').chmod(0o600)
+    return tmpdir
+
+def perms(path):
+    """Returns the permissions of path."""
+    return os.lstat(str(path)).st_mode & 511
+
+def test_chmod_tree(tree):
+    """Test setting file and directory permissions throughout a tree."""
+    stats = chmod_tree(str(tree), 0o644, 0o755)
+    assert not stats.errors
+    assert stats.changed == 2  # sub and sub/b.txt
+    assert stats.unchanged == 2  # The top and a.txt
+    assert perms(tree.join('sub')) == 0o755
+    assert perms(tree.join('sub', 'b.txt')) == 0o644
+    assert chmod_tree(str(tree), 0o644, 0o755).changed == 0
+
+def test_chmod_tree_files_only(tree):
+    """Test that directories are left alone without dir_perms."""
+    stats = chmod_tree(str(tree), file_perms=0o640)
+    assert stats.changed == 2
+    assert perms(tree.join('sub')) == 0o700
+    assert perms(tree.join('a.txt')) == perms(tree.join('sub', 'b.txt')) == 0o640
+
+def test_chmod_tree_entry_swapped_for_link(tree, tmpdir_factory):
+    """Test that an entry swapped for a link after it is listed isn't followed."""
+    outside = tmpdir_factory.mktemp('outside').join('secret')
+    outside.write('DB_PASSWORD=...')
+    outside.chmod(0o600)
+    entries = tree_module._entries  # pylint: disable=protected-access
+
+    def swapping_entries(top, stats):
+        """Swaps sub/b.txt for a link after it is listed."""
+        for entry in entries(top, stats):
+            if entry[0].endswith('b.txt'):
+                os.remove(entry[0])
+                os.symlink(str(outside), entry[0])
+            yield entry
+
+    with patch('ext_pylib.files.tree._entries', swapping_entries):
+        stats = chmod_tree(str(tree), 0o644)
+    assert not stats.errors
+    assert perms(outside) == 0o600
+
+def test_chmod_tree_unreadable_file(tree):
+    """Test that a file its owner can't read (so can't be opened) is still
+    changed."""
+    tree.join('sub', 'b.txt').chmod(0o000)
+    fchmod = tree_module._fchmod  # pylint: disable=protected-access
+
+    def unreadable(name, *args):
+        """Fails to open b.txt, as it would for anyone but root."""
+        if name.endswith('b.txt'):
+            raise OSError(errno.EACCES, 'Permission denied', name)
+        return fchmod(name, *args)
+
+    with patch('ext_pylib.files.tree._fchmod', side_effect=unreadable):
+        stats = chmod_tree(str(tree), 0o644)
+    assert not stats.errors
+    assert stats.changed == 1
+    assert perms(tree.join('sub', 'b.txt')) == 0o644
+
+def test_chown_tree_unchanged(tree):
+    """Test that entries that already have the owner and group are skipped."""
+    stat = os.stat(str(tree))
+    with patch('os.chown') as mock_chown, patch('os.lchown') as mock_lchown:
+        stats = chown_tree(str(tree), stat.st_uid, stat.st_gid)
+    assert not mock_chown.called and not mock_lchown.called
+    assert stats.unchanged == 5 and stats.changed == 0
+
+def test_chown_tree(tree):
+    """Test changing the owner of everything in a tree without following links."""
+    with patch('os.chown') as mock_chown, patch('os.lchown') as mock_lchown:
+        stats = chown_tree(str(tree), 12345, -1)
+    assert stats.changed == 5 and not stats.errors
+    calls = mock_chown.call_args_list + mock_lchown.call_args_list
+    assert all(call[0][1:] == (12345, -1) for call in calls)
+    assert all(call[1].get('follow_symlinks', False) is False for call in mock_chown.call_args_list[1:])
+
+def test_chmod_tree_missing(tmpdir):
+    """Test that a missing top is an error rather than an exception."""
+    stats = chmod_tree(str(tmpdir.join('missing')), 0o644, 0o755)
+    assert len(stats.errors) == 1
+
+@patch('ext_pylib.files.dir.getgrnam')
+@patch('ext_pylib.files.dir.getpwnam')
+@patch('ext_pylib.files.dir.chown_tree')
+def test_dir_chown_tree(mock_chown_tree, mock_getpwnam, mock_getgrnam):
+    """Test that Dir.chown_tree() resolves the names once."""
+    mock_getpwnam.return_value.pw_uid = 123
+    mock_getgrnam.return_value.gr_gid = 456
+    mock_chown_tree.return_value.errors = []
+    the_dir = Dir({'path' : '/the/dir/'})
+    assert the_dir.chown_tree('www-data', 'www-data')
+    mock_getpwnam.assert_called_once_with('www-data')
+    mock_getgrnam.assert_called_once_with('www-data')
+    mock_chown_tree.assert_called_once_with('/the/dir/', 123, 456)
+
+def test_dir_chmod_tree(tree):
+    """Test that Dir.chmod_tree() defaults dir_perms to the Dir's perms."""
+    the_dir = Dir({'path' : str(tree), 'perms' : 0o750})
+    assert the_dir.chmod_tree(0o600)
+    assert perms(tree) == perms(tree.join('sub')) == 0o750
+    assert perms(tree.join('a.txt')) == 0o600
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_verify.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's verification engine.
+"""
+
+import os
+
+from mock import patch
+
+from ext_pylib.files import Dir, File, verify_many, repair_many
+from ext_pylib.files.verify import verify_node
+from ext_pylib.user import get_current_username, get_current_groupname
+
+
+CURRENT_USER = get_current_username()
+CURRENT_GROUP = get_current_groupname()
+
+
+def test_verify_node_stub():
+    """Test that a stub always verifies."""
+    result = verify_node(File())
+    assert result.ok
+    assert result.failures == []
+
+def test_verify_node_nonexisting(tmpdir):
+    """Test verifying a node that doesn't exist."""
+    result = File({'path' : str(tmpdir.join('missing'))}).check()
+    assert not result
+    assert result.exists is False
+    assert result.failures == ['exists']
+
+def test_verify_node_passing_stats_once(tmpdir):
+    """Test that a passing node is stat'ed exactly once."""
+    path = str(tmpdir.join('file'))
+    open(path, 'w').close()
+    os.chmod(path, 0o640)
+    the_file = File({'path' : path, 'perms' : 0o640, 'owner' : CURRENT_USER, 'group' : CURRENT_GROUP})
+    with patch('os.stat', wraps=os.stat) as mock_stat:
+        result = the_file.check()
+    assert result.ok
+    assert mock_stat.call_count == 1
+    assert result.checks == {'perms' : (0o640, 0o640),
+                             'owner' : (CURRENT_USER, CURRENT_USER),
+                             'group' : (CURRENT_GROUP, CURRENT_GROUP)}
+
+def test_verify_node_failing_perms(tmpdir):
+    """Test verifying a node with the wrong permissions."""
+    path = str(tmpdir.join('file'))
+    open(path, 'w').close()
+    os.chmod(path, 0o644)
+    result = File({'path' : path, 'perms' : 0o600}).check()
+    assert not result.ok
+    assert result.failures == ['perms']
+    assert result.checks['perms'] == (0o600, 0o644)
+    assert result.repaired == []
+
+def test_verify_node_repair_perms(tmpdir):
+    """Test that repairing a node re-stats it only once more."""
+    path = str(tmpdir.join('file'))
+    open(path, 'w').close()
+    os.chmod(path, 0o644)
+    with patch('os.stat', wraps=os.stat) as mock_stat:
+        result = File({'path' : path, 'perms' : 0o600}).check(repair=True)
+    assert result.ok
+    assert result.repaired == ['perms']
+    assert mock_stat.call_count == 2
+    assert os.stat(path).st_mode & 511 == 0o600
+
+def test_verify_node_repair_nonexisting(tmpdir):
+    """Test that repairing a missing node creates it."""
+    path = str(tmpdir.join('new_dir'))
+    result = Dir({'path' : path, 'perms' : 0o750}).check(repair=True)
+    assert result.ok
+    assert result.repaired == ['exists']
+    assert os.path.isdir(path)
+
+def test_verify_many_keeps_order(tmpdir):
+    """Test that verify_many returns results in the order nodes were given."""
+    paths = [str(tmpdir.join('file' + str(i))) for i in range(20)]
+    for path in paths[::2]:
+        open(path, 'w').close()
+    report = verify_many([File({'path' : path}) for path in paths], workers=4)
+    assert len(report) == 20
+    assert [result.path for result in report] == paths
+    assert [result.exists for result in report] == [True, False] * 10
+    assert not report.ok
+    assert [result.path for result in report.failures] == paths[1::2]
+
+def test_repair_many(tmpdir):
+    """Test that repair_many repairs every node."""
+    paths = [str(tmpdir.join('file' + str(i))) for i in range(10)]
+    for path in paths:
+        open(path, 'w').close()
+        os.chmod(path, 0o644)
+    report = repair_many([File({'path' : path, 'perms' : 0o600}) for path in paths], workers=3)
+    assert report.ok
+    assert len(report.repaired) == 10
+    assert all(os.stat(path).st_mode & 511 == 0o600 for path in paths)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_watch.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+#
+# pylint:           disable=invalid-name,line-too-long
+
+"""
+A unit test for ext_pylib file module's change notifications.
+"""
+
+import time
+
+import pytest
+
+from ext_pylib.files import Dir, File, InotifyWatcher, PollingWatcher, atomic_write
+
+
+def make_watcher(kind):
+    """Returns a new watcher of kind, or skips the test if it isn't available."""
+    if kind == 'polling':
+        return PollingWatcher(interval=0.01)
+    try:
+        return InotifyWatcher()
+    except OSError:
+        pytest.skip('inotify is not available.')
+
+def poll(watcher, changes):
+    """Polls watcher until changes (a list) isn't empty (or a second passes)."""
+    deadline = time.time() + 1
+    while not changes and time.time() < deadline:
+        watcher.poll(0.05)
+    return changes
+
+@pytest.fixture(params=['inotify', 'polling'])
+def watcher(request):
+    """Returns each kind of watcher, closed after the test."""
+    a_watcher = make_watcher(request.param)
+    request.addfinalizer(a_watcher.close)
+    return a_watcher
+
+
+def test_watcher_file(tmpdir, watcher):
+    """Test that a watcher calls the callback when a watched file changes
+    (or is replaced), and not for the other files in its directory."""
+    path = tmpdir.join('file')
+    path.write('The data...')
+    changes = []
+    watcher.watch(str(path), changes.append)
+    tmpdir.join('other').write('Other data...')
+    watcher.poll(0.05)
+    assert changes == []
+    path.write('New data, and more of it...')
+    assert poll(watcher, changes) == [str(path)]
+    del changes[:]
+    atomic_write(str(path), 'Replaced...')
+    assert poll(watcher, changes) == [str(path)]
+
+def test_watcher_directory(tmpdir, watcher):
+    """Test that a watcher calls the callback for each changed entry of a
+    watched directory."""
+    changes = []
+    watcher.watch(str(tmpdir) + '/', changes.append)
+    tmpdir.join('file').write('The data...')
+    assert poll(watcher, changes) == [str(tmpdir.join('file'))]
+
+def test_watcher_unwatch(tmpdir, watcher):
+    """Test that unwatch() stops calling the callback."""
+    path = tmpdir.join('file')
+    changes = []
+    watcher.watch(str(path), changes.append)
+    watcher.watch(str(tmpdir.join('other')), changes.append)
+    assert watcher.paths == [str(path), str(tmpdir.join('other'))]
+    watcher.unwatch(str(path), changes.append)
+    watcher.unwatch(str(tmpdir.join('other')))
+    assert watcher.paths == []
+    path.write('The data...')
+    watcher.poll(0.05)
+    assert changes == []
+
+def test_watcher_thread(tmpdir, watcher):
+    """Test that a started watcher calls the callbacks from its thread."""
+    path = tmpdir.join('file')
+    changes = []
+    watcher.interval = 0.01
+    watcher.watch(str(path), changes.append)
+    with watcher:
+        path.write('The data...')
+        deadline = time.time() + 1
+        while not changes and time.time() < deadline:
+            time.sleep(0.01)
+    assert changes == [str(path)]
+
+def test_node_watch(tmpdir, watcher):
+    """Test that a watched File drops its data when it changes, and that a
+    watched Dir calls its callback with the changed entry."""
+    path = tmpdir.join('file')
+    path.write('The data...')
+    a_file, a_dir = File({'path' : str(path)}), Dir({'path' : str(tmpdir)})
+    changes = []
+    assert a_file.watch(lambda node, changed: changes.append(node), watcher)
+    assert a_dir.watch(lambda node, changed: changes.append(changed), watcher)
+    assert a_file.read() == 'The data...'
+    path.write('New data, and more of it...')
+    poll(watcher, changes)
+    assert changes == [a_file, str(path)]
+    assert a_file.read() == 'New data, and more of it...'
+    a_file.unwatch()
+    a_dir.unwatch()
+    assert watcher.paths == []
+
+def test_file_watch_keeps_data_changed_in_memory(tmpdir, watcher):
+    """Test that a watched File only rereads data that wasn't changed in
+    memory, including after its own write()."""
+    path = tmpdir.join('file')
+    path.write('The data...')
+    a_file = File({'path' : str(path)})
+    changes = []
+    a_file.watch(lambda node, changed: changes.append(changed), watcher)
+    a_file.read()
+    a_file.data = a_file.data + '\nMore data...'
+    path.write('Changed on disk, and more of it...')
+    poll(watcher, changes)
+    assert a_file.data == a_file.read() == 'The data...\nMore data...'
+    del changes[:]
+    assert a_file.write(append=False)
+    poll(watcher, changes)
+    assert a_file.read() == 'The data...\nMore data...'
+    del changes[:]
+    path.write('Changed on disk again!')
+    poll(watcher, changes)
+    assert a_file.read() == 'Changed on disk again!'
+    a_file.unwatch()
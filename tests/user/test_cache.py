@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# name:             test_cache.py
+# author:           Harold Bradley III
+# email:            harold@bradleystudio.net
+# created on:       10/18/2026
+
+"""
+A unit test for ext_pylib user module's NameCache class.
+"""
+
+from mock import patch
+import pytest
+
+from ext_pylib.user import NameCache
+
+
+@patch('pwd.getpwnam')
+def test_name_cache_hits_and_misses(mock_getpwnam):
+    """Test that repeated lookups are served from the cache."""
+    cache = NameCache()
+    assert cache.getpwnam('www-data') is mock_getpwnam.return_value
+    assert cache.getpwnam('www-data') is mock_getpwnam.return_value
+    assert cache.getpwnam('www-data') is mock_getpwnam.return_value
+    mock_getpwnam.assert_called_once_with('www-data')
+    assert cache.stats() == {'hits' : 2, 'misses' : 1, 'entries' : 1}
+
+@patch('grp.getgrgid')
+def test_name_cache_ttl(mock_getgrgid):
+    """Test that expired entries are looked up again."""
+    cache = NameCache(ttl=0)
+    cache.getgrgid(33)
+    cache.getgrgid(33)
+    assert mock_getgrgid.call_count == 2
+    assert cache.stats()['hits'] == 0
+
+@patch('pwd.getpwuid')
+def test_name_cache_invalidate(mock_getpwuid):
+    """Test that invalidate() empties the cache but keeps the counters."""
+    cache = NameCache(ttl=None)
+    cache.getpwuid(0)
+    cache.invalidate()
+    cache.getpwuid(0)
+    assert mock_getpwuid.call_count == 2
+    assert cache.stats() == {'hits' : 0, 'misses' : 2, 'entries' : 1}
+    cache.reset_stats()
+    assert cache.stats() == {'hits' : 0, 'misses' : 0, 'entries' : 1}
+
+@patch('grp.getgrnam')
+def test_name_cache_does_not_cache_failures(mock_getgrnam):
+    """Test that a failed lookup raises KeyError every time."""
+    mock_getgrnam.side_effect = KeyError('nonexistent')
+    cache = NameCache()
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            cache.getgrnam('nonexistent')
+    assert mock_getgrnam.call_count == 2
+    assert cache.stats()['entries'] == 0